@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import math
+import statistics
+from collections import defaultdict
+from dataclasses import dataclass
+
+from benchmarks.suite import Measurement
+
+TOTAL = "total"
+# Timings below this are dominated by interpreter overhead and flatten the fit
+MIN_SECONDS = 0.001
+CLASSES = [
+    (0.0, "O(1)"),
+    (0.5, "O(√n)"),
+    (1.0, "O(n)"),
+    (1.5, "O(n^1.5)"),
+    (2.0, "O(n²)"),
+    (2.5, "O(n^2.5)"),
+    (3.0, "O(n³)"),
+]
+
+
+@dataclass
+class Fit:
+    day: str
+    phase: str
+    unit: str
+    exponent: float
+    points: list[tuple[int, float]]
+
+    @property
+    def complexity_class(self) -> str:
+        return complexity_class(self.exponent)
+
+    def __str__(self) -> str:
+        return f"Day {self.day} {self.phase:<8} ≈ {self.complexity_class:<9} (n = {self.unit}, exponent {self.exponent:.2f})"
+
+
+def complexity_class(exponent: float) -> str:
+    if exponent > CLASSES[-1][0] + 0.25:
+        return f"O(n^{exponent:.1f})"
+    return min(CLASSES, key=lambda item: abs(item[0] - exponent))[1]
+
+
+def fit_exponent(points: list[tuple[int, float]]) -> float:
+    """
+    Least-squares slope of log(time) against log(size), i.e. k in time ≈ c * size^k.
+    :param points: (size, seconds) pairs with at least two distinct sizes
+    :return:
+    """
+    xs = [math.log(size) for size, _ in points]
+    ys = [math.log(seconds) for _, seconds in points]
+    x_mean = statistics.fmean(xs)
+    y_mean = statistics.fmean(ys)
+    variance = sum((x - x_mean) ** 2 for x in xs)
+    if variance == 0:
+        raise ValueError("Need at least two distinct sizes to fit")
+    return sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys)) / variance
+
+
+def phase_medians(measurement: Measurement) -> dict[str, float]:
+    medians = {TOTAL: measurement.median}
+    elapsed = defaultdict(list)
+    for result in measurement.results:
+        for phase in result.phases:
+            elapsed[phase.name].append(phase.elapsed_ns / 1e9)
+    for name, times in elapsed.items():
+        medians[name] = statistics.median(times)
+    return medians
+
+
+def fit_measurements(measurements: list[Measurement], min_seconds: float = MIN_SECONDS) -> list[Fit]:
+    points = defaultdict(list)
+    units = {}
+    for measurement in measurements:
+        if measurement.error:
+            continue
+        units[measurement.day] = measurement.unit
+        for name, seconds in phase_medians(measurement).items():
+            if seconds >= min_seconds:
+                points[measurement.day, name].append((measurement.size, seconds))
+
+    fits = []
+    for (day, name), day_points in sorted(points.items()):
+        if len({size for size, _ in day_points}) < 2:
+            continue
+        fits.append(Fit(day, name, units[day], fit_exponent(day_points), day_points))
+    return fits
+
+
+def format_report(fits: list[Fit], superlinear: float = 1.25) -> str:
+    out = "Empirical complexity\n"
+    for fit in fits:
+        flag = "  <-- super-linear" if fit.exponent > superlinear else ""
+        out += f"{fit}{flag}\n"
+    return out
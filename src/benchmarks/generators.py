@@ -0,0 +1,393 @@
+from __future__ import annotations
+
+import math
+import string
+from random import Random
+
+# Every generator takes a size and a seeded Random and returns the text of a valid puzzle input.
+# What "size" counts differs per day and is recorded as the unit of its benchmark.
+
+SNAFU_DIGITS = "=-012"
+
+
+def day_01(size: int, rng: Random) -> str:
+    """size: number of elves"""
+    out = []
+    for _ in range(size):
+        out.extend(str(rng.randint(1000, 60000)) for _ in range(rng.randint(1, 15)))
+        out.append("")
+    return "\n".join(out[:-1]) + "\n"
+
+
+def day_02(size: int, rng: Random) -> str:
+    """size: number of rounds"""
+    return "".join(f"{rng.choice('ABC')} {rng.choice('XYZ')}\n" for _ in range(size))
+
+
+def day_03(size: int, rng: Random) -> str:
+    """size: number of rucksacks, rounded up to a whole group of three"""
+    items = string.ascii_letters
+    out = []
+    for _ in range(math.ceil(size / 3)):
+        badge = rng.choice(items)
+        pool = [item for item in items if item != badge]
+        rng.shuffle(pool)
+        for member in range(3):
+            member_pool = pool[member * 16:(member + 1) * 16]
+            common, left_only, right_only = member_pool[0], member_pool[1:8], member_pool[8:]
+            half = rng.randint(6, 16)
+            left = [badge, common] + [rng.choice(left_only) for _ in range(half - 2)]
+            right = [common] + [rng.choice(right_only) for _ in range(half - 1)]
+            rng.shuffle(left)
+            rng.shuffle(right)
+            out.append("".join(left + right))
+    return "\n".join(out) + "\n"
+
+
+def day_04(size: int, rng: Random) -> str:
+    """size: number of assignment pairs"""
+    out = []
+    for _ in range(size):
+        first = sorted(rng.randint(1, 99) for _ in range(2))
+        second = sorted(rng.randint(1, 99) for _ in range(2))
+        out.append(f"{first[0]}-{first[1]},{second[0]}-{second[1]}")
+    return "\n".join(out) + "\n"
+
+
+def day_05(size: int, rng: Random) -> str:
+    """size: number of moves; no stack is ever emptied, as the answer reads every top crate"""
+    stack_count = 9
+    stacks = [[rng.choice(string.ascii_uppercase) for _ in range(rng.randint(1, 8))] for _ in range(stack_count)]
+    height = max(len(stack) for stack in stacks)
+    drawing = []
+    for level in range(height - 1, -1, -1):
+        row = [f"[{stack[level]}]" if level < len(stack) else "   " for stack in stacks]
+        drawing.append(" ".join(row))
+    drawing.append(" ".join(f" {i + 1} " for i in range(stack_count)))
+
+    moves = []
+    for _ in range(size):
+        source = rng.choice([i for i, stack in enumerate(stacks) if len(stack) > 1])
+        target = rng.choice([i for i in range(stack_count) if i != source])
+        quantity = rng.randint(1, len(stacks[source]) - 1)
+        stacks[target].extend(stacks[source][-quantity:])
+        del stacks[source][-quantity:]
+        moves.append(f"move {quantity} from {source + 1} to {target + 1}")
+    return "\n".join(drawing) + "\n\n" + "\n".join(moves) + "\n"
+
+
+def day_06(size: int, rng: Random) -> str:
+    """size: signal length; both markers sit at the very end so the whole signal is scanned"""
+    noise = "".join(rng.choice("abc") for _ in range(max(0, size - 15)))
+    marker = list(string.ascii_lowercase[:14])
+    rng.shuffle(marker)
+    return noise + "".join(marker) + marker[0] + "\n"
+
+
+def day_07(size: int, rng: Random) -> str:
+    """size: number of filesystem entries; the transcript walks the tree depth first"""
+    children: list[list[int]] = [[]]
+    files: list[list[int]] = [[]]
+    for _ in range(max(1, size)):
+        parent = rng.randrange(len(children))
+        if rng.random() < 0.25:
+            children[parent].append(len(children))
+            children.append([])
+            files.append([])
+        else:
+            files[parent].append(rng.randint(1000, 300000))
+
+    out = ["$ cd /"]
+    stack = [(0, False)]
+    while stack:
+        directory, listed = stack.pop()
+        if listed:
+            out.append("$ cd ..")
+            continue
+        if directory:
+            out.append(f"$ cd d{directory}")
+            stack.append((directory, True))
+        out.append("$ ls")
+        out.extend(f"dir d{child}" for child in children[directory])
+        out.extend(f"{file_size} f{i}.txt" for i, file_size in enumerate(files[directory]))
+        stack.extend((child, False) for child in reversed(children[directory]))
+    while out[-1] == "$ cd ..":
+        out.pop()
+    return "\n".join(out) + "\n"
+
+
+def day_08(size: int, rng: Random) -> str:
+    """size: number of trees (square forest)"""
+    side = max(2, math.isqrt(size))
+    return "".join("".join(rng.choice(string.digits) for _ in range(side)) + "\n" for _ in range(side))
+
+
+def day_09(size: int, rng: Random) -> str:
+    """size: number of head moves"""
+    return "".join(f"{rng.choice('UDLR')} {rng.randint(1, 20)}\n" for _ in range(size))
+
+
+def day_10(size: int, rng: Random) -> str:
+    """size: number of instructions, capped at the 240 cycles the CRT can draw"""
+    out = []
+    cycles = 0
+    while len(out) < size:
+        if rng.random() < 0.3 or cycles + 2 > 240:
+            if cycles + 1 > 240:
+                break
+            out.append("noop")
+            cycles += 1
+        else:
+            out.append(f"addx {rng.randint(-10, 10)}")
+            cycles += 2
+    return "\n".join(out) + "\n"
+
+
+def day_11(size: int, rng: Random) -> str:
+    """size: number of monkeys"""
+    primes = [2, 3, 5, 7, 11, 13, 17, 19, 23]
+    out = []
+    for monkey in range(max(2, size)):
+        items = ", ".join(str(rng.randint(50, 99)) for _ in range(rng.randint(1, 8)))
+        operation = rng.choice(["old * old", f"old * {rng.randint(2, 19)}", f"old + {rng.randint(1, 8)}"])
+        targets = [target for target in range(max(2, size)) if target != monkey]
+        out.append(
+            f"Monkey {monkey}:\n"
+            f"  Starting items: {items}\n"
+            f"  Operation: new = {operation}\n"
+            f"  Test: divisible by {rng.choice(primes)}\n"
+            f"    If true: throw to monkey {rng.choice(targets)}\n"
+            f"    If false: throw to monkey {rng.choice(targets)}\n"
+        )
+    return "\n".join(out)
+
+
+def day_12(size: int, rng: Random) -> str:
+    """size: number of cells; elevation ramps from a to z across the columns with scattered pits"""
+    width = max(26, math.isqrt(size * 4))
+    height = max(2, size // width)
+    rows = []
+    for y in range(height):
+        row = []
+        for x in range(width):
+            elevation = x * 25 // (width - 1)
+            if 0 < x < width - 1 and rng.random() < 0.02:
+                elevation = rng.randint(0, elevation)
+            row.append(chr(ord("a") + elevation))
+        rows.append(row)
+    rows[height // 2][0] = "S"
+    rows[height // 2][-1] = "E"
+    return "".join("".join(row) + "\n" for row in rows)
+
+
+def day_13(size: int, rng: Random) -> str:
+    """size: number of packet pairs"""
+
+    def packet(depth: int) -> str:
+        values = []
+        for _ in range(rng.randint(0, 5)):
+            if depth < 4 and rng.random() < 0.3:
+                values.append(packet(depth + 1))
+            else:
+                values.append(str(rng.randint(0, 10)))
+        return "[" + ",".join(values) + "]"
+
+    return "\n".join(f"{packet(0)}\n{packet(0)}\n" for _ in range(size))
+
+
+def day_14(size: int, rng: Random) -> str:
+    """size: cave depth; the number of rock paths grows with it"""
+    depth = max(4, size)
+    out = []
+    for _ in range(max(1, depth // 5)):
+        x, y = rng.randint(500 - depth, 500 + depth), rng.randint(2, depth)
+        points = [(x, y)]
+        for _ in range(rng.randint(1, 4)):
+            if rng.random() < 0.5:
+                x = max(1, x + rng.randint(-6, 6))
+            else:
+                y = min(depth, max(2, y + rng.randint(-6, 6)))
+            points.append((x, y))
+        out.append(" -> ".join(f"{x},{y}" for x, y in points))
+    out.append(f"{500 - depth},{depth} -> {500 - depth + 1},{depth}")
+    return "\n".join(out) + "\n"
+
+
+def day_15(size: int, rng: Random) -> str:
+    """
+    size: number of sensors
+    Four corner sensors leave exactly one uncovered point in the 0..4000000 square; every
+    other sensor stops just short of it. The gap sits near the top so rows are scanned quickly.
+    """
+    limit = 4000000
+    gap = (rng.randint(1, limit - 1), rng.randint(500, 1500))
+    sensors = [(0, 0), (limit, 0), (0, limit), (limit, limit)]
+    sensors += [(rng.randint(0, limit), rng.randint(0, limit)) for _ in range(max(0, size - 4))]
+    out = []
+    for x, y in sensors:
+        if (x, y) == gap:
+            continue
+        radius = abs(x - gap[0]) + abs(y - gap[1]) - 1
+        out.append(f"Sensor at x={x}, y={y}: closest beacon is at x={x}, y={y - radius}")
+    return "\n".join(out) + "\n"
+
+
+def day_16(size: int, rng: Random) -> str:
+    """size: number of valves"""
+    names = [f"{a}{b}" for a in string.ascii_uppercase for b in string.ascii_uppercase][:max(2, size)]
+    neighbors = {name: set() for name in names}
+    for i, name in enumerate(names[1:], start=1):
+        other = names[rng.randint(0, i - 1)]
+        neighbors[name].add(other)
+        neighbors[other].add(name)
+    out = []
+    for i, name in enumerate(names):
+        rate = 0 if i == 0 or rng.random() < 0.5 else rng.randint(1, 25)
+        tunnels = sorted(neighbors[name])
+        plural = "s lead to valves" if len(tunnels) > 1 else " leads to valve"
+        out.append(f"Valve {name} has flow rate={rate}; tunnel{plural} {', '.join(tunnels)}")
+    return "\n".join(out) + "\n"
+
+
+def day_17(size: int, rng: Random) -> str:
+    """size: jet stream length"""
+    return "".join(rng.choice("<>") for _ in range(size)) + "\n"
+
+
+def day_18(size: int, rng: Random) -> str:
+    """size: number of cubes, packed into a box roughly three times their volume"""
+    side = max(2, round((size * 3) ** (1 / 3)))
+    cubes = set()
+    while len(cubes) < min(size, side ** 3):
+        cubes.add((rng.randrange(side), rng.randrange(side), rng.randrange(side)))
+    return "".join(f"{x},{y},{z}\n" for x, y, z in cubes)
+
+
+def day_19(size: int, rng: Random) -> str:
+    """size: number of blueprints"""
+    return "".join(
+        f"Blueprint {i + 1}: Each ore robot costs {rng.randint(2, 4)} ore. "
+        f"Each clay robot costs {rng.randint(2, 4)} ore. "
+        f"Each obsidian robot costs {rng.randint(2, 4)} ore and {rng.randint(5, 20)} clay. "
+        f"Each geode robot costs {rng.randint(2, 4)} ore and {rng.randint(5, 20)} obsidian.\n"
+        for i in range(size)
+    )
+
+
+def day_20(size: int, rng: Random) -> str:
+    """size: length of the encrypted list"""
+    values = [rng.choice([-1, 1]) * rng.randint(1, 10000) for _ in range(max(1, size - 1))]
+    values.insert(rng.randint(0, len(values)), 0)
+    return "".join(f"{value}\n" for value in values)
+
+
+def day_21(size: int, rng: Random) -> str:
+    """
+    size: number of monkeys
+    humn feeds a chain of +, - and * operations into the left side of root, so the equality
+    has a single integer solution that the search converges on.
+    """
+    names = set()
+    lines = []
+
+    def new_name() -> str:
+        while (name := "".join(rng.choice(string.ascii_lowercase) for _ in range(4))) in names | {"root", "humn"}:
+            pass
+        names.add(name)
+        return name
+
+    def constant(value: int, budget: int) -> str:
+        name = new_name()
+        if budget <= 1 or value == 0:
+            lines.append(f"{name}: {value}")
+            return name
+        budget -= 1
+        left_budget = budget // 2
+        match rng.choice("+-*/"):
+            case "+" if value > 1:
+                left = rng.randint(1, value - 1)
+                lines.append(f"{name}: {constant(left, left_budget)} + {constant(value - left, budget - left_budget)}")
+            case "*" if value % 2 == 0:
+                lines.append(f"{name}: {constant(value // 2, left_budget)} * {constant(2, budget - left_budget)}")
+            case "/":
+                divisor = rng.randint(2, 9)
+                lines.append(f"{name}: {constant(value * divisor, left_budget)} / {constant(divisor, budget - left_budget)}")
+            case _:
+                right = rng.randint(1, 20)
+                lines.append(f"{name}: {constant(value + right, left_budget)} - {constant(right, budget - left_budget)}")
+        return name
+
+    chain_length = max(1, min(size // 10, 100))
+    sibling_budget = max(1, (size - chain_length * 2) // (chain_length + 1))
+    answer = rng.randint(10 ** 9, 10 ** 10)
+    value = answer
+    current = "humn"
+    lines.append(f"humn: {rng.randint(1, 5000)}")
+    for _ in range(chain_length):
+        name = new_name()
+        match rng.choice("+-*"):
+            case "+":
+                operand = rng.randint(1, 100)
+                lines.append(f"{name}: {current} + {constant(operand, sibling_budget)}")
+                value += operand
+            case "-":
+                operand = rng.randint(1, 100)
+                lines.append(f"{name}: {current} - {constant(operand, sibling_budget)}")
+                value -= operand
+            case "*":
+                operand = rng.randint(2, 3)
+                lines.append(f"{name}: {constant(operand, sibling_budget)} * {current}")
+                value *= operand
+        current = name
+    lines.append(f"root: {current} + {constant(value, sibling_budget)}")
+    rng.shuffle(lines)
+    return "\n".join(lines) + "\n"
+
+
+def day_22(size: int, rng: Random) -> str:
+    """size: number of path instructions; the ragged map grows with the square root of it"""
+    side = max(8, math.isqrt(size) * 4)
+    rows = []
+    for y in range(side):
+        length = rng.randint(side * 3 // 4, side)
+        row = ["#" if rng.random() < 0.1 else "." for _ in range(length)]
+        rows.append("".join(row))
+    rows[0] = "." + rows[0][1:]
+    path = ""
+    for i in range(max(1, size)):
+        path += str(rng.randint(1, 50))
+        if i < size - 1:
+            path += rng.choice("LR")
+    return "\n".join(rows) + "\n\n" + path + "\n"
+
+
+def day_23(size: int, rng: Random) -> str:
+    """size: number of cells in the starting field (about half of them hold an elf)"""
+    side = max(2, math.isqrt(size))
+    return "".join("".join("#" if rng.random() < 0.5 else "." for _ in range(side)) + "\n" for _ in range(side))
+
+
+def day_24(size: int, rng: Random) -> str:
+    """size: number of valley cells"""
+    width = max(3, math.isqrt(size * 3))
+    height = max(3, size // width)
+    rows = ["#." + "#" * width]
+    for _ in range(height):
+        # Keep vertical blizzards out of the entrance and exit columns
+        row = [rng.choice("<>^v....." if 0 < x < width - 1 else "<>.....") for x in range(width)]
+        rows.append("#" + "".join(row) + "#")
+    rows.append("#" * width + ".#")
+    return "\n".join(rows) + "\n"
+
+
+def day_25(size: int, rng: Random) -> str:
+    """size: number of SNAFU numbers"""
+    out = []
+    for _ in range(size):
+        value = rng.randint(1, 10 ** 12)
+        digits = ""
+        while value:
+            value, remainder = divmod(value + 2, 5)
+            digits = SNAFU_DIGITS[remainder] + digits
+        out.append(digits)
+    return "\n".join(out) + "\n"
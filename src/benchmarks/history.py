@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import platform
+import subprocess
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from benchmarks.complexity import MIN_SECONDS
+from benchmarks.suite import Measurement
+
+HISTORY_FILE = "benchmark-history.jsonl"
+# Runs from a working tree with uncommitted changes are kept apart from the commit they started from
+DIRTY_SUFFIX = "+dirty"
+WORKING_TREE = "working-tree"
+
+
+@dataclass
+class Record:
+    commit: str
+    dirty: bool
+    machine: str
+    timestamp: float
+    seed: int
+    day: str
+    size: int
+    unit: str
+    median: float | None
+    peak_memory: int | None
+    error: str | None = None
+
+    @property
+    def key(self) -> tuple[str, int, int]:
+        return self.day, self.size, self.seed
+
+    @property
+    def revision(self) -> str:
+        return self.commit + DIRTY_SUFFIX if self.dirty else self.commit
+
+
+@dataclass
+class Regression:
+    day: str
+    size: int
+    unit: str
+    metric: str
+    baseline: float
+    candidate: float
+
+    @property
+    def change(self) -> float:
+        return self.candidate / self.baseline - 1
+
+    def __str__(self) -> str:
+        spec = "12.4f" if self.metric == "median (s)" else "12,.0f"
+        return (
+            f"Day {self.day} {self.size:>10} {self.unit:<12} {self.metric:<11} "
+            f"{self.baseline:{spec}} -> {self.candidate:{spec}} ({self.change:+.1%})"
+        )
+
+
+def machine_fingerprint() -> str:
+    """
+    Identifies the hardware and interpreter, but not the host name, so throwaway CI runners of
+    the same kind share a fingerprint.
+    :return:
+    """
+    machine = [
+        platform.system(),
+        platform.release(),
+        platform.machine(),
+        platform.processor(),
+        platform.python_implementation(),
+        platform.python_version(),
+        str(os.cpu_count()),
+    ]
+    return hashlib.sha256("|".join(machine).encode()).hexdigest()[:12]
+
+
+def git_commit() -> tuple[str, bool]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True, check=True
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", True
+    return commit, bool(status.strip())
+
+
+def short_revision(revision: str) -> str:
+    if revision.endswith(DIRTY_SUFFIX):
+        return revision[:12] + DIRTY_SUFFIX
+    return revision[:12]
+
+
+def resolve_revision(name: str) -> str:
+    """
+    Turns "HEAD" and "working-tree" into the revisions their runs are recorded under.
+    :param name: A commit, "HEAD" or "working-tree"
+    :return:
+    """
+    match name:
+        case "HEAD":
+            return git_commit()[0]
+        case "working-tree":
+            return git_commit()[0] + DIRTY_SUFFIX
+    return name
+
+
+def peak_memory(measurement: Measurement) -> int | None:
+    peaks = [
+        phase.peak_memory
+        for result in measurement.results
+        for phase in result.phases
+        if phase.peak_memory is not None
+    ]
+    return max(peaks) if peaks else None
+
+
+def record_measurements(
+    measurements: list[Measurement], seed: int, path: str = HISTORY_FILE, machine: str | None = None
+) -> list[Record]:
+    """
+    :param measurements:
+    :param seed:
+    :param path:
+    :param machine: Name to record instead of the machine fingerprint
+    :return:
+    """
+    commit, dirty = git_commit()
+    machine = machine or machine_fingerprint()
+    timestamp = time.time()
+    records = [
+        Record(
+            commit,
+            dirty,
+            machine,
+            timestamp,
+            seed,
+            measurement.day,
+            measurement.size,
+            measurement.unit,
+            measurement.median,
+            peak_memory(measurement),
+            measurement.error,
+        )
+        for measurement in measurements
+    ]
+    with open(path, "a", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(asdict(record)) + "\n")
+    return records
+
+
+def load_history(path: str = HISTORY_FILE) -> list[Record]:
+    if not Path(path).exists():
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return [Record(**json.loads(line)) for line in f if line.strip()]
+
+
+def revisions(records: list[Record]) -> list[str]:
+    """
+    Recorded revisions, oldest first by their latest run. A commit run with uncommitted changes
+    is a separate revision, the commit followed by DIRTY_SUFFIX.
+    :param records:
+    :return:
+    """
+    latest = {}
+    for record in records:
+        latest[record.revision] = max(latest.get(record.revision, 0), record.timestamp)
+    return sorted(latest, key=latest.__getitem__)
+
+
+def latest_by_key(records: list[Record], revision: str) -> dict[tuple[str, int, int], Record]:
+    latest = {}
+    for record in sorted(records, key=lambda record: record.timestamp):
+        if record.revision == revision:
+            latest[record.key] = record
+    return latest
+
+
+def compare(
+    records: list[Record],
+    baseline: str,
+    candidate: str,
+    threshold: float = 0.1,
+    memory_threshold: float = 0.1,
+    min_seconds: float = MIN_SECONDS,
+) -> list[Regression]:
+    """
+    Flags every (day, size, seed) whose median time or peak memory grew by more than the threshold.
+    Records should come from a single machine; timings across machines are not comparable.
+    :param records:
+    :param baseline: Revision to compare against
+    :param candidate: Revision under test
+    :param threshold: Allowed relative growth of the median time
+    :param memory_threshold: Allowed relative growth of the peak memory
+    :param min_seconds: Times below this on both sides are too noisy to compare
+    :return:
+    """
+    baseline_records = latest_by_key(records, baseline)
+    candidate_records = latest_by_key(records, candidate)
+    regressions = []
+    for key, new in sorted(candidate_records.items()):
+        if (old := baseline_records.get(key)) is None or old.error:
+            continue
+        if new.error:
+            regressions.append(Regression(new.day, new.size, new.unit, "error", old.median, float("inf")))
+            continue
+        if max(old.median, new.median) >= min_seconds and new.median > old.median * (1 + threshold):
+            regressions.append(Regression(new.day, new.size, new.unit, "median (s)", old.median, new.median))
+        if old.peak_memory and new.peak_memory and new.peak_memory > old.peak_memory * (1 + memory_threshold):
+            regressions.append(
+                Regression(new.day, new.size, new.unit, "peak (B)", old.peak_memory, new.peak_memory)
+            )
+    return regressions
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import re
+import subprocess
+import sys
+from dataclasses import dataclass, field
+
+from days.runner import DAYS_DIR
+
+# "import time: self [us] | cumulative | imported package", nesting shown by indentation
+IMPORT_TIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+DEFAULT_BUDGET_MS = 100
+
+
+@dataclass
+class ImportEntry:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class ImportCost:
+    day: str
+    cumulative_us: int | None = None
+    # Modules imported along with the day that took the longest themselves
+    heaviest: list[ImportEntry] = field(default_factory=list)
+    error: str | None = None
+
+    def over_budget(self, budget_ms: float) -> bool:
+        return self.error is not None or self.cumulative_us > budget_ms * 1000
+
+    def __str__(self) -> str:
+        if self.error:
+            return f"Day {self.day}: {'error':>10}  {self.error}"
+        heaviest = ", ".join(f"{entry.module} {entry.self_us / 1000:.1f}" for entry in self.heaviest)
+        return f"Day {self.day}: {self.cumulative_us / 1000:7.1f} ms  ({heaviest})"
+
+
+def parse_importtime(stderr: str) -> list[ImportEntry]:
+    entries = []
+    for line in stderr.splitlines():
+        if match := IMPORT_TIME.match(line):
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append(ImportEntry(module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return entries
+
+
+def measure_import(day: str, repeats: int = 3, heaviest: int = 3) -> ImportCost:
+    """
+    Imports the day in fresh interpreters under -X importtime and keeps the fastest run.
+    The cost covers everything the day pulls in that the bare interpreter has not loaded yet.
+    :param day:
+    :param repeats: Interpreters to start; the fastest import is reported to filter out noise
+    :param heaviest: Number of most expensive modules to list
+    :return:
+    """
+    module = f"days.{day}.main"
+    best = None
+    for _ in range(repeats):
+        # __import__ goes through the interpreter's timed import path, importlib.import_module does not
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"__import__({module!r})"],
+            cwd=DAYS_DIR.parent,
+            capture_output=True,
+            text=True,
+        )
+        if process.returncode != 0:
+            lines = process.stderr.strip().splitlines()
+            return ImportCost(day, error=lines[-1] if lines else f"exit code {process.returncode}")
+
+        entries = parse_importtime(process.stderr)
+        # Skip the interpreter's own startup imports
+        startup = (i for i, entry in enumerate(entries) if entry.module == "site" and entry.depth == 0)
+        entries = entries[next(startup, -1) + 1:]
+        total = next(entry for entry in entries if entry.module == module and entry.depth == 0)
+        if best is None or total.cumulative_us < best.cumulative_us:
+            best = ImportCost(
+                day,
+                total.cumulative_us,
+                sorted(entries, key=lambda entry: entry.self_us, reverse=True)[:heaviest],
+            )
+    return best
+
+
+def format_import_report(costs: list[ImportCost], budget_ms: float) -> str:
+    out = f"Import time (budget {budget_ms:g} ms; heaviest modules by self time in ms)\n"
+    for cost in costs:
+        flag = "  <-- over budget" if cost.over_budget(budget_ms) else ""
+        out += f"{cost}{flag}\n"
+    return out
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import tempfile
+from dataclasses import asdict
+from pathlib import Path
+from random import Random
+
+from benchmarks.complexity import fit_measurements, format_report
+from benchmarks.history import (
+    DIRTY_SUFFIX,
+    HISTORY_FILE,
+    compare,
+    load_history,
+    machine_fingerprint,
+    record_measurements,
+    resolve_revision,
+    revisions,
+    short_revision,
+)
+from benchmarks.imports import DEFAULT_BUDGET_MS, format_import_report, measure_import
+from benchmarks.suite import BENCHMARKS, Benchmark, Measurement
+from days.runner import DayResult, load_day, parse_days, run_file
+
+
+def _measure(day: str, filename: str, repeats: int, trace_memory: bool) -> list[DayResult]:
+    # Import before timing
+    load_day(day)
+    return [run_file(day, filename, trace_memory) for _ in range(repeats)]
+
+
+def measure(
+    benchmark: Benchmark,
+    size: int,
+    directory: Path,
+    repeats: int = 3,
+    timeout: float = 60,
+    seed: int = 0,
+    trace_memory: bool = False,
+) -> Measurement:
+    measurement = Measurement(benchmark.day, size, benchmark.unit)
+    path = directory / f"{benchmark.day}-{size}.txt"
+    path.write_text(benchmark.generate(size, Random(f"{seed}:{benchmark.day}:{size}")), encoding="utf-8")
+
+    pool = multiprocessing.Pool(1)
+    try:
+        pending = pool.apply_async(_measure, (benchmark.day, str(path), repeats, trace_memory))
+        measurement.results = pending.get(timeout * repeats)
+    except multiprocessing.TimeoutError:
+        measurement.error = f"timed out after {timeout}s"
+    except Exception as e:
+        measurement.error = f"{type(e).__name__}: {e}"
+    finally:
+        pool.terminate()
+        pool.join()
+
+    for result in measurement.results:
+        if result.error:
+            measurement.error = result.error
+            break
+    return measurement
+
+
+def run_suite(
+    days: list[str],
+    scale: float = 1,
+    repeats: int = 3,
+    timeout: float = 60,
+    seed: int = 0,
+    trace_memory: bool = False,
+) -> list[Measurement]:
+    measurements = []
+    with tempfile.TemporaryDirectory(prefix="aoc-bench-") as directory:
+        for day in days:
+            benchmark = BENCHMARKS[day]
+            print(f"Day {day}")
+            for size in benchmark.sizes:
+                size = max(1, round(size * scale))
+                measurement = measure(benchmark, size, Path(directory), repeats, timeout, seed, trace_memory)
+                measurements.append(measurement)
+                print(measurement)
+                # Larger inputs will only fail or time out as well
+                if measurement.error:
+                    break
+    return measurements
+
+
+def write_measurements(measurements: list[Measurement], path: str) -> None:
+    out = {"measurements": [], "complexity": []}
+    for measurement in measurements:
+        data = asdict(measurement)
+        for result in data["results"]:
+            del result["output"]
+        data["median"] = measurement.median
+        out["measurements"].append(data)
+    for fit in fit_measurements(measurements):
+        out["complexity"].append(asdict(fit) | {"class": fit.complexity_class})
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(out, f, indent=2)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="benchmarks", description="Time each day across a ladder of generated inputs")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmark suite")
+    run_parser.add_argument("days", nargs="?", default="01-25", help="Days to benchmark, e.g. 01-25 or 3,5,7")
+    run_parser.add_argument("--scale", type=float, default=1, help="Multiply every size in the ladder")
+    run_parser.add_argument("--repeats", type=int, default=3, help="Runs per size; the median is reported")
+    run_parser.add_argument("--timeout", type=float, default=60, help="Seconds allowed per run before giving up")
+    run_parser.add_argument("--seed", type=int, default=0, help="Seed for the input generators")
+    run_parser.add_argument("--memory", action="store_true", help="Trace peak memory of each phase (slower)")
+    run_parser.add_argument("--json", metavar="PATH", help="Write every measurement and complexity fit as JSON")
+    run_parser.add_argument(
+        "--superlinear", type=float, default=1.25, help="Flag phases whose fitted exponent exceeds this"
+    )
+    run_parser.add_argument("--record", action="store_true", help="Append the results to the history file")
+    run_parser.add_argument("--history", default=HISTORY_FILE, help="History file (JSON lines)")
+    run_parser.add_argument("--machine", help="Record under this machine name instead of the fingerprint")
+
+    compare_parser = commands.add_parser("compare", help="Compare two recorded commits on this machine")
+    compare_parser.add_argument(
+        "--baseline",
+        help="Baseline commit, HEAD or working-tree (default: the candidate's commit if it is a working tree, "
+        "else the previously recorded commit)",
+    )
+    compare_parser.add_argument(
+        "--candidate", help="Candidate commit, HEAD or working-tree (default: the latest recorded revision)"
+    )
+    compare_parser.add_argument("--threshold", type=float, default=0.1, help="Allowed relative slowdown")
+    compare_parser.add_argument("--memory-threshold", type=float, default=0.1, help="Allowed relative memory growth")
+    compare_parser.add_argument("--history", default=HISTORY_FILE, help="History file (JSON lines)")
+    compare_parser.add_argument("--machine", help="Compare runs recorded under this machine name")
+
+    imports_parser = commands.add_parser("imports", help="Check the import time of each day against a budget")
+    imports_parser.add_argument("days", nargs="?", default="01-25", help="Days to check, e.g. 01-25 or 3,5,7")
+    imports_parser.add_argument(
+        "--budget", type=float, default=DEFAULT_BUDGET_MS, help="Allowed import time per day in milliseconds"
+    )
+    imports_parser.add_argument("--repeats", type=int, default=3, help="Fresh interpreters per day; the fastest counts")
+    args = parser.parse_args(argv)
+
+    match args.command:
+        case "run":
+            measurements = run_suite(
+                parse_days(args.days), args.scale, args.repeats, args.timeout, args.seed, args.memory
+            )
+            print()
+            print(format_report(fit_measurements(measurements), args.superlinear), end="")
+            if args.json:
+                write_measurements(measurements, args.json)
+            if args.record:
+                record_measurements(measurements, args.seed, args.history, args.machine)
+            return 0
+        case "compare":
+            return compare_commits(
+                args.history, args.baseline, args.candidate, args.threshold, args.memory_threshold, args.machine
+            )
+        case "imports":
+            costs = [measure_import(day, args.repeats) for day in parse_days(args.days)]
+            print(format_import_report(costs, args.budget), end="")
+            return 1 if any(cost.over_budget(args.budget) for cost in costs) else 0
+
+
+def compare_commits(
+    history: str,
+    baseline: str | None,
+    candidate: str | None,
+    threshold: float,
+    memory_threshold: float,
+    machine: str | None = None,
+) -> int:
+    machine = machine or machine_fingerprint()
+    records = [record for record in load_history(history) if record.machine == machine]
+    recorded = revisions(records)
+    candidate = resolve_revision(candidate) if candidate else (recorded[-1] if recorded else None)
+    if baseline:
+        baseline = resolve_revision(baseline)
+    elif candidate and candidate.endswith(DIRTY_SUFFIX) and candidate.removesuffix(DIRTY_SUFFIX) in recorded:
+        # Uncommitted changes are measured against the commit they were made on
+        baseline = candidate.removesuffix(DIRTY_SUFFIX)
+    else:
+        # Working-tree runs only serve as a baseline when asked for by name
+        earlier = [
+            revision for revision in recorded if revision != candidate and not revision.endswith(DIRTY_SUFFIX)
+        ]
+        baseline = earlier[-1] if earlier else None
+    if baseline not in recorded or candidate not in recorded:
+        print("Need results for two revisions on this machine to compare")
+        return 2
+
+    regressions = compare(records, baseline, candidate, threshold, memory_threshold)
+    print(f"Baseline {short_revision(baseline)} -> candidate {short_revision(candidate)} on machine {machine}")
+    for regression in regressions:
+        print(regression)
+    print(f"{len(regressions)} regression(s)")
+    return 1 if regressions else 0
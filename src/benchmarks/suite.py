@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import statistics
+from dataclasses import dataclass, field
+from random import Random
+from typing import Callable
+
+from benchmarks import generators
+from days.runner import DayResult
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    day: str
+    generate: Callable[[int, Random], str]
+    unit: str
+    sizes: tuple[int, ...]
+
+
+@dataclass
+class Measurement:
+    day: str
+    size: int
+    unit: str
+    results: list[DayResult] = field(default_factory=list)
+    error: str | None = None
+
+    @property
+    def wall_times(self) -> list[float]:
+        return [result.wall_time for result in self.results]
+
+    @property
+    def median(self) -> float | None:
+        return statistics.median(self.wall_times) if self.results and not self.error else None
+
+    def __str__(self) -> str:
+        if self.error:
+            return f"{self.size:>10} {self.unit:<12} {self.error}"
+        times = self.wall_times
+        return f"{self.size:>10} {self.unit:<12} median {self.median:9.4f}s  min {min(times):9.4f}s  max {max(times):9.4f}s"
+
+
+BENCHMARKS = {
+    benchmark.day: benchmark
+    for benchmark in [
+        Benchmark("01", generators.day_01, "elves", (250, 2500, 25000)),
+        Benchmark("02", generators.day_02, "rounds", (2500, 25000, 250000)),
+        Benchmark("03", generators.day_03, "rucksacks", (300, 3000, 30000)),
+        Benchmark("04", generators.day_04, "pairs", (1000, 10000, 100000)),
+        Benchmark("05", generators.day_05, "moves", (500, 5000, 50000)),
+        Benchmark("06", generators.day_06, "characters", (4096, 40960, 409600)),
+        Benchmark("07", generators.day_07, "entries", (250, 1000, 4000)),
+        Benchmark("08", generators.day_08, "trees", (2500, 10000, 40000)),
+        Benchmark("09", generators.day_09, "moves", (2000, 20000, 200000)),
+        Benchmark("10", generators.day_10, "instructions", (50, 100, 150)),
+        Benchmark("11", generators.day_11, "monkeys", (4, 8, 16, 32)),
+        Benchmark("12", generators.day_12, "cells", (1000, 4000, 16000)),
+        Benchmark("13", generators.day_13, "pairs", (150, 1500, 15000)),
+        Benchmark("14", generators.day_14, "depth", (40, 80, 160, 320)),
+        Benchmark("15", generators.day_15, "sensors", (30, 300, 3000)),
+        Benchmark("16", generators.day_16, "valves", (2, 4, 6, 8)),
+        Benchmark("17", generators.day_17, "jets", (1000, 10000, 100000)),
+        Benchmark("18", generators.day_18, "cubes", (300, 3000, 30000)),
+        Benchmark("19", generators.day_19, "blueprints", (30, 300, 3000)),
+        Benchmark("20", generators.day_20, "numbers", (500, 1000, 2000, 5000)),
+        Benchmark("21", generators.day_21, "monkeys", (200, 2000, 20000)),
+        Benchmark("22", generators.day_22, "instructions", (400, 4000, 40000)),
+        Benchmark("23", generators.day_23, "cells", (100, 400, 1600)),
+        Benchmark("24", generators.day_24, "cells", (12, 48, 192)),
+        Benchmark("25", generators.day_25, "numbers", (120, 1200, 12000)),
+    ]
+}
@@ -1,23 +1,132 @@
+from __future__ import annotations
+
 import heapq
-with open("input.txt", "r", encoding="utf-8") as f:
-    lines = f.readlines()
-
-sum = 0
-sums = []
-for line in lines:
-    if line == "\n":
-        sums += [sum]
-        sum = 0
-        continue
-    sum += -int(line[:-1])
-if sum != 0:
-    sums += [sum]
-
-heapq.heapify(sums)
-top_n = 3
-max = 0
-for _ in range(top_n):
-    sum = heapq.heappop(sums)
-    max += sum
-
-print(f"max: {abs(max)}")
+import os
+import sys
+from array import array
+from itertools import chain, repeat
+from typing import Iterable, Iterator
+
+from days.common.inputs import day_input, read_lines
+from days.common.instrument import phase, profiling, recording
+
+
+def elf_totals(lines: Iterable[str | bytes]) -> Iterator[int]:
+    """
+    Sums each run of non-blank lines, i.e. the calories carried by each elf.
+    :param lines: Text or binary lines, with or without line endings
+    :return:
+    """
+    total = 0
+    carrying = False
+    for line in lines:
+        if line.strip():
+            total += int(line)
+            carrying = True
+        elif carrying:
+            yield total
+            total = 0
+            carrying = False
+    if carrying:
+        yield total
+
+
+def top_k(totals: Iterable[int], k: int) -> list[int]:
+    """
+    The k largest totals, largest first, keeping only a k-sized min-heap in memory.
+    :param totals:
+    :param k:
+    :return:
+    """
+    heap = []
+    for total in totals:
+        if len(heap) < k:
+            heapq.heappush(heap, total)
+        elif total > heap[0]:
+            heapq.heapreplace(heap, total)
+    return sorted(heap, reverse=True)
+
+
+def top_calories(filename: str, k: int = 3) -> list[int]:
+    return top_k(elf_totals(read_lines(filename)), k)
+
+
+def chunk_ranges(filename: str, chunks: int) -> list[tuple[int, int]]:
+    """
+    Splits a file into roughly equal byte ranges that each start at the beginning of an elf.
+    :param filename:
+    :param chunks:
+    :return: (start, end) byte offsets; end is exclusive
+    """
+    size = os.path.getsize(filename)
+    boundaries = [0]
+    with open(filename, "rb") as f:
+        for i in range(1, chunks):
+            offset = max(size * i // chunks, boundaries[-1])
+            if offset:
+                # Finish the line the offset falls in, which may be the newline ending it
+                f.seek(offset - 1)
+                f.readline()
+            # Move on past the next blank line; everything after it belongs to a new elf
+            while (line := f.readline()) and line.strip():
+                pass
+            boundaries.append(f.tell())
+    boundaries.append(size)
+    return [(start, end) for start, end in zip(boundaries, boundaries[1:]) if start < end]
+
+
+def read_range(filename: str, start: int, end: int) -> Iterator[bytes]:
+    with open(filename, "rb") as f:
+        f.seek(start)
+        while f.tell() < end and (line := f.readline()):
+            yield line
+
+
+def range_top_calories(filename: str, start: int, end: int, k: int = 3) -> list[int]:
+    return top_k(elf_totals(read_range(filename, start, end)), k)
+
+
+def parallel_chunk_tops(filename: str, k: int = 3, jobs: int | None = None) -> list[int]:
+    """
+    The top k totals of each byte range of the file, found in a process pool, for very large
+    inputs. The overall top k are among them.
+    :param filename:
+    :param k:
+    :param jobs: Worker processes and chunks; None uses every CPU
+    :return:
+    """
+    # Only paid for when running in parallel
+    from concurrent.futures import ProcessPoolExecutor
+
+    jobs = jobs or os.cpu_count()
+    ranges = chunk_ranges(filename, jobs)
+    starts = [start for start, _ in ranges]
+    ends = [end for _, end in ranges]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        tops = executor.map(range_top_calories, repeat(filename), starts, ends, repeat(k))
+        return list(chain.from_iterable(tops))
+
+
+def parallel_top_calories(filename: str, k: int = 3, jobs: int | None = None) -> list[int]:
+    return top_k(parallel_chunk_tops(filename, k, jobs), k)
+
+
+def run(filename: str, k: int = 3, jobs: int = 1) -> None:
+    with phase("totals"):
+        if jobs == 1:
+            # 8 bytes per elf, far smaller than the input itself
+            totals = array("q", elf_totals(read_lines(filename)))
+        else:
+            # Workers stream their own ranges, so only their top k come back
+            totals = parallel_chunk_tops(filename, k, jobs)
+
+    with phase("top k"):
+        top = top_k(totals, k)
+
+    print(f"max: {sum(top)}")
+
+
+if __name__ == '__main__':
+    with recording() as report, profiling("01", "--profile" in sys.argv):
+        run(day_input(__file__, "input.txt"))
+    print(report)
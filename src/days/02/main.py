@@ -1,3 +1,12 @@
+from __future__ import annotations
+
+import sys
+from collections import Counter
+
+from days.common.inputs import day_input
+from days.common.instrument import phase, profiling, recording
+
+
 def determine_score(one: str, two: str) -> int:
     """
     A,X - Rock, B,Y - Paper, C,Z - Scissors
@@ -83,12 +92,48 @@ def determine_score_two(one: str, two: str) -> int:
     return play_needed[two][one]
 
 
-with open("input.txt", "r", encoding="utf-8") as f:
-    plays = f.readlines()
+# Every possible round, e.g. b"A X", with its score under each reading of the strategy guide
+ROUNDS = [f"{one} {two}" for one in "ABC" for two in "XYZ"]
+SCORES = {play.encode(): determine_score(*play.split()) for play in ROUNDS}
+SCORES_TWO = {play.encode(): determine_score_two(*play.split()) for play in ROUNDS}
+
+
+def count_rounds(data: bytes) -> Counter[bytes]:
+    """
+    Occurrences of each round, counted by scanning the raw input once per possible round.
+    A round cannot match across lines since every line is exactly "<ABC> <XYZ>".
+    :param data:
+    :return:
+    """
+    return Counter({play: data.count(play) for play in SCORES})
+
+
+def score_rounds(rounds: Counter[bytes]) -> tuple[int, int]:
+    """
+    Total score of both strategy guide readings from how often each of the 9 rounds occurs.
+    :param rounds:
+    :return: Score reading XYZ as the play, score reading it as the outcome
+    """
+    return (
+        sum(SCORES[play] * count for play, count in rounds.items()),
+        sum(SCORES_TWO[play] * count for play, count in rounds.items()),
+    )
+
+
+def run(filename: str) -> None:
+    with phase("parse"):
+        with open(filename, "rb") as f:
+            rounds = count_rounds(f.read())
+
+    # Both parts come out of the same histogram
+    with phase("score"):
+        total_score, total_score_two = score_rounds(rounds)
+
+    print(total_score)
+    print(total_score_two)
 
-total_score = 0
-for play in plays:
-    player_one, player_two = play[:-1].split(" ")
-    total_score += determine_score_two(player_one, player_two)
 
-print(total_score)
+if __name__ == '__main__':
+    with recording() as report, profiling("02", "--profile" in sys.argv):
+        run(day_input(__file__, "input.txt"))
+    print(report)
@@ -1,49 +1,77 @@
-def item_to_priority(item: str) -> int:
-    ascii_value = ord(item)
-    priority_ = 0
-    if ord("A") <= ascii_value <= ord("Z"):
-        priority_ += 26
-    priority_ += ord(item.lower()) - ord("a") + 1
-    return priority_
+from __future__ import annotations
 
+import string
+import sys
+from functools import reduce
+from operator import and_
 
-def split_bag(bag: str) -> tuple[str, str]:
+from days.common.inputs import day_input
+from days.common.instrument import phase, profiling, recording
+
+
+# Items in priority order: the item at index i has priority i + 1
+ITEMS = (string.ascii_lowercase + string.ascii_uppercase).encode()
+# After marking the items of a rucksack with 1, clears every unmarked item to 0
+MARKED = bytes(1 if byte == 1 else 0 for byte in range(256))
+
+
+def split_bag(bag: bytes) -> tuple[bytes, bytes]:
     half_len_bag = int(len(bag)/2)
     return bag[:half_len_bag], bag[half_len_bag:]
 
 
-def find_common_item(*lists: str) -> str:
-    base = set(lists[0])
-    for list_ in lists[1:]:
-        base = base.intersection(list_)
-    return next(iter(base))
+def item_mask(items: bytes) -> int:
+    """
+    Encodes the set of items as an int with the lowest bit of byte (priority - 1) set per item.
+    One byte per item rather than one bit lets bytes.translate build the mask without a Python
+    loop over the items; AND-ing masks still intersects them.
+    :param items:
+    :return:
+    """
+    marked = ITEMS.translate(bytes.maketrans(items, b"\x01" * len(items))).translate(MARKED)
+    return int.from_bytes(marked, "little")
+
 
+def mask_priority(mask: int) -> int:
+    """
+    Priority of the highest item in the mask; with a single item, of that item.
+    :param mask:
+    :return:
+    """
+    return (mask.bit_length() + 7) // 8
 
-def find_total_priority(bags: list[str]) -> int:
+
+def find_total_priority(bags: list[bytes]) -> int:
     total_priority = 0
     for bag_ in bags:
         compartment_one_, compartment_two_ = split_bag(bag_)
-        common = find_common_item(compartment_one_, compartment_two_)
-        priority = item_to_priority(common)
-        total_priority += priority
+        total_priority += mask_priority(item_mask(compartment_one_) & item_mask(compartment_two_))
     return total_priority
 
 
-def badge_group_total_priority(bags: list[str], group_size: int) -> int:
+def badge_group_total_priority(bags: list[bytes], group_size: int) -> int:
+    masks = [item_mask(bag) for bag in bags]
     total = 0
     for i in range(int(len(bags) / group_size)):
         start = i * group_size
-        item = find_common_item(*bags[start:start+group_size])
-        total += item_to_priority(item)
+        total += mask_priority(reduce(and_, masks[start:start + group_size]))
     return total
 
 
-if __name__ == '__main__':
-    with open("input.txt", "r",
-              encoding="utf-8") as f:
-        bags_ = [line.strip() for line in f.readlines()]
+def run(filename: str) -> None:
+    with phase("parse"):
+        with open(filename, "rb") as f:
+            bags_ = f.read().split()
     print("Bag Total Priority")
-    print(find_total_priority(bags_))
+    with phase("part 1"):
+        print(find_total_priority(bags_))
 
     print("Badge Group Total Priority")
-    print(badge_group_total_priority(bags_, 3))
+    with phase("part 2"):
+        print(badge_group_total_priority(bags_, 3))
+
+
+if __name__ == '__main__':
+    with recording() as report, profiling("03", "--profile" in sys.argv):
+        run(day_input(__file__, "input.txt"))
+    print(report)
@@ -1,42 +1,186 @@
+from __future__ import annotations
+
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Iterator, Sequence
+
+from days.common.inputs import day_input, read_ints
+from days.common.instrument import phase, profiling, recording
+
+
+@dataclass(frozen=True)
 class Range:
     start: int
     end: int
 
-    def __init__(self, range_str: str):
+    @classmethod
+    def parse(cls, range_str: str) -> Range:
         start, end = range_str.split("-")
-        self.start = int(start)
-        self.end = int(end)
+        return cls(int(start), int(end))
 
-    def __contains__(self, item) -> bool:
+    def __contains__(self, item: Range) -> bool:
         return self.start <= item.start and self.end >= item.end
 
-    def overlaps(self, item) -> bool:
-        return self.start <= item.start <= self.end
+    def overlaps(self, item: Range) -> bool:
+        return self.start <= item.end and item.start <= self.end
 
 
-def total_contained(range_pairs: list[list[str]]) -> int:
-    total = 0
-    for pair in range_pairs:
-        range_one = Range(pair[0])
-        range_two = Range(pair[1])
-        if range_two in range_one or range_one in range_two:
-            total += 1
-    return total
+@dataclass
+class Assignments:
+    """
+    The section ranges of every pair of elves, one array per endpoint.
+    """
+    start_one: array
+    end_one: array
+    start_two: array
+    end_two: array
 
+    @classmethod
+    def from_values(cls, values: list[int]) -> Assignments:
+        """
+        :param values: start one, end one, start two, end two for every pair, flattened
+        :return:
+        """
+        return cls(*(array("q", values[i::4]) for i in range(4)))
 
-def total_overlaps(range_pairs: list[list[str]]) -> int:
-    total = 0
-    for pair in range_pairs:
-        range_one = Range(pair[0])
-        range_two = Range(pair[1])
-        if range_two.overlaps(range_one) or range_one.overlaps(range_two):
-            total += 1
-    return total
+    def __len__(self) -> int:
+        return len(self.start_one)
 
+    def pair(self, index: int) -> tuple[Range, Range]:
+        return (
+            Range(self.start_one[index], self.end_one[index]),
+            Range(self.start_two[index], self.end_two[index]),
+        )
 
-if __name__ == '__main__':
-    with open("input.txt", "r", encoding="utf-8") as f:
-        pairs = [line.strip().split(",") for line in f.readlines()]
 
-    print(total_contained(pairs))
-    print(total_overlaps(pairs))
+def count_pairs(assignments: Assignments) -> tuple[int, int]:
+    """
+    Counts in one pass the pairs where one range contains the other and the pairs that overlap.
+    :param assignments:
+    :return: contained, overlapping
+    """
+    contained = 0
+    overlapping = 0
+    for start_one, end_one, start_two, end_two in zip(
+        assignments.start_one, assignments.end_one, assignments.start_two, assignments.end_two
+    ):
+        if start_one <= end_two and start_two <= end_one:
+            overlapping += 1
+            if (start_one <= start_two and end_two <= end_one) or (start_two <= start_one and end_one <= end_two):
+                contained += 1
+    return contained, overlapping
+
+
+class IntervalIndex:
+    """
+    Static index over ranges for repeated section queries without rescanning every pair.
+    Counts come from two binary searches over the sorted starts and sorted ends. Listing walks
+    the ranges sorted by start under an implicit tree of maximum ends, only entering subtrees
+    that still reach the section.
+    """
+
+    def __init__(self, starts: Sequence[int], ends: Sequence[int]):
+        """
+        :param starts: First section of every range
+        :param ends: Last section of every range, in the same order
+        """
+        order = sorted(range(len(starts)), key=starts.__getitem__)
+        self.order = array("q", order)
+        self.starts = array("q", sorted(starts))
+        self.ends = array("q", sorted(ends))
+
+        # Leaves are the ends in start order, every other node the largest end below it
+        self.leaves = 1
+        while self.leaves < len(order):
+            self.leaves *= 2
+        self.max_ends = array("q", [-1]) * self.leaves
+        self.max_ends.extend(map(ends.__getitem__, order))
+        self.max_ends.extend(array("q", [-1]) * (self.leaves - len(order)))
+        max_ends = self.max_ends
+        for node in range(self.leaves - 1, 0, -1):
+            left = max_ends[2 * node]
+            right = max_ends[2 * node + 1]
+            max_ends[node] = left if left > right else right
+
+    @classmethod
+    def from_ranges(cls, ranges: Sequence[Range]) -> IntervalIndex:
+        return cls([item.start for item in ranges], [item.end for item in ranges])
+
+    @classmethod
+    def from_assignments(cls, assignments: Assignments) -> IntervalIndex:
+        """
+        Indexes both ranges of every pair; range 2 * i is the first elf of pair i, 2 * i + 1 the second.
+        :param assignments:
+        :return:
+        """
+        starts = array("q", [0]) * (2 * len(assignments))
+        ends = array("q", starts)
+        starts[0::2] = assignments.start_one
+        starts[1::2] = assignments.start_two
+        ends[0::2] = assignments.end_one
+        ends[1::2] = assignments.end_two
+        return cls(starts, ends)
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def count_overlapping(self, item: Range) -> int:
+        """
+        Number of ranges sharing at least one section with the item, i.e. all but the ones ending
+        before it starts and the ones starting after it ends.
+        :param item:
+        :return:
+        """
+        ending_before = bisect_left(self.ends, item.start)
+        starting_after = len(self) - bisect_right(self.starts, item.end)
+        return len(self) - ending_before - starting_after
+
+    def count_covering(self, section: int) -> int:
+        return self.count_overlapping(Range(section, section))
+
+    def covering(self, section: int) -> Iterator[int]:
+        """
+        Positions of the ranges, in the order they were given, that include the section.
+        :param section:
+        :return: In order of range start
+        """
+        # Only ranges starting at or before the section can include it
+        started = bisect_right(self.starts, section)
+        stack = [(1, 0, self.leaves)]
+        while stack:
+            node, low, high = stack.pop()
+            if low >= started or self.max_ends[node] < section:
+                continue
+            if node >= self.leaves:
+                yield self.order[low]
+                continue
+            middle = (low + high) // 2
+            stack.append((2 * node + 1, middle, high))
+            stack.append((2 * node, low, middle))
+
+    def covering_pairs(self, section: int) -> list[int]:
+        """
+        Pairs with at least one elf assigned to the section, for an index built from_assignments().
+        :param section:
+        :return:
+        """
+        return sorted({position // 2 for position in self.covering(section)})
+
+
+def run(filename: str) -> None:
+    with phase("parse"):
+        assignments = Assignments.from_values(read_ints(filename, negative=False))
+
+    # Both parts come out of the same pass
+    with phase("count"):
+        contained, overlapping = count_pairs(assignments)
+    print(contained)
+    print(overlapping)
+
+
+if __name__ == '__main__':
+    with recording() as report, profiling("04", "--profile" in sys.argv):
+        run(day_input(__file__, "input.txt"))
+    print(report)
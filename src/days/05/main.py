@@ -1,54 +1,117 @@
+from __future__ import annotations
+
+import sys
+from array import array
+from itertools import takewhile
+from typing import Iterable, Iterator
+
+from days.common.inputs import day_input, read_lines
+from days.common.instrument import phase, profiling, recording
+
 
 def parse_crates(lines: list[str]) -> list[list[str]]:
+    """
+    Reads the stacks bottom to top out of the drawing, one column of crate letters at a time.
+    :param lines: The drawing, ending with the line of stack numbers
+    :return:
+    """
     num_queues = int(lines[-1].strip()[-1])
-    queues = [[] for _ in range(num_queues)]
-    for crate_line in lines[:-1]:
-        for i in range(num_queues):
-            index = 1 + (4 * i)
-            if index < len(crate_line):
-                crate = crate_line[index].strip()
-                if crate:
-                    queues[i].insert(0, crate)
+    width = 4 * num_queues - 1
+    # Crate letters sit at every fourth character, starting from the second
+    rows = [line.ljust(width)[1::4] for line in reversed(lines[:-1])]
+    return [list("".join(column).rstrip()) for column in zip(*rows)]
 
-    return queues
 
+def parse_moves(lines: Iterable[str]) -> array:
+    """
+    Packs "move <quantity> from <source> to <target>" lines into a flat int array.
+    :param lines:
+    :return: quantity, source, target for every move; stacks are numbered from 1 as in the input
+    """
+    moves = array("l")
+    for line in lines:
+        # Every second word is a number
+        moves.extend(map(int, line.split()[1::2]))
+    return moves
 
-def parse_move(move: str) -> tuple[int, int, int]:
-    source_crate = int(move[move.index("from") + 5:move.index("to") - 1]) - 1
-    target_crate = int(move[move.index("to") + 3:]) - 1
-    quantity = int(move[move.index("move") + 5:move.index("from") - 1])
-    return source_crate, target_crate, quantity
 
+def execute_move_9000(queues: list[list[str]], quantity: int, source_crate: int, target_crate: int) -> None:
+    """
+    Moves the crates one at a time, so they land in reverse order.
+    """
+    source = queues[source_crate]
+    start = len(source) - quantity
+    queues[target_crate].extend(reversed(source[start:]))
+    del source[start:]
 
-def execute_move_9000(queues: list[list[str]], move: str) -> list[list[str]]:
-    source_crate, target_crate, quantity = parse_move(move)
-    for _ in range(quantity):
-        queues[target_crate].append(queues[source_crate].pop())
-    return queues
 
+def execute_move_9001(queues: list[list[str]], quantity: int, source_crate: int, target_crate: int) -> None:
+    """
+    Moves the crates all at once, so they keep their order.
+    """
+    source = queues[source_crate]
+    start = len(source) - quantity
+    queues[target_crate].extend(source[start:])
+    del source[start:]
 
-def execute_move_9001(queues: list[list[str]], move: str) -> list[list[str]]:
-    source_crate, target_crate, quantity = parse_move(move)
-    temp = []
-    for _ in range(quantity):
-        temp = [queues[source_crate].pop()] + temp
-    for crate in temp:
-        queues[target_crate].append(crate)
-    return queues
 
+CRANES = {
+    9000: execute_move_9000,
+    9001: execute_move_9001,
+}
 
-if __name__ == '__main__':
-    with open("input.txt", "r", encoding="utf-8") as f:
-        l = f.readline()[:-1]
-        data = []
-        while l:
-            data += [l]
-            l = f.readline()[:-1]
 
-        crates = parse_crates(data)
-        moves = [move.strip() for move in f.readlines()]
+def top_crates(queues: list[list[str]]) -> str:
+    return "".join(queue[-1] if queue else " " for queue in queues)
+
+
+def apply_moves(queues: list[list[str]], moves: array, crane: int = 9001) -> None:
+    execute_move = CRANES[crane]
+    for i in range(0, len(moves), 3):
+        execute_move(queues, moves[i], moves[i + 1] - 1, moves[i + 2] - 1)
+
 
-    for move in moves:
-        crates = execute_move_9001(crates, move)
+def stream_moves(
+        queues: list[list[str]],
+        lines: Iterable[str],
+        crane: int = 9001,
+        report_every: int = 0,
+) -> Iterator[tuple[int, str]]:
+    """
+    Applies each move as soon as its line is read, so the move log is never held in memory.
+    :param queues:
+    :param lines: Move lines, e.g. the rest of read_lines() after the drawing
+    :param crane: CrateMover model, 9000 or 9001
+    :param report_every: Yield the top crates after every this many moves; 0 never does
+    :return: Moves applied so far and the top crate of every stack, blank for an empty one
+    """
+    execute_move = CRANES[crane]
+    for count, line in enumerate(filter(None, lines), 1):
+        _, quantity, _, source, _, target = line.split()
+        execute_move(queues, int(quantity), int(source) - 1, int(target) - 1)
+        if report_every and count % report_every == 0:
+            yield count, top_crates(queues)
 
-    print([crate[-1] for crate in crates])
+
+def run(filename: str, crane: int = 9001, stream: bool = False, report_every: int = 0) -> None:
+    with phase("parse"):
+        lines = read_lines(filename)
+        # The drawing ends at the first blank line; the moves follow it
+        crates = parse_crates(list(takewhile(bool, lines)))
+        # Progress reports come from the streamed moves, so asking for them implies streaming
+        moves = None if stream or report_every else parse_moves(lines)
+
+    with phase("moves"):
+        if moves is None:
+            for count, tops in stream_moves(crates, lines, crane, report_every):
+                print(f"{count}: {tops}")
+        else:
+            apply_moves(crates, moves, crane)
+
+    print(top_crates(crates))
+
+
+if __name__ == '__main__':
+    with recording() as report, profiling("05", "--profile" in sys.argv):
+        run(day_input(__file__, "input.txt"), stream="--stream" in sys.argv)
+    print(report)
@@ -1,20 +1,135 @@
-from collections import Counter
+import mmap
+import os
+import sys
+from itertools import repeat
+from typing import Iterable
 
+from days.common.inputs import day_input, map_line
+from days.common.instrument import phase, profiling, recording
 
-def find_first_marker(code: str, unique_count: int) -> int:
-    counter = Counter(code[:unique_count])
-    for i, c in enumerate(code[unique_count:]):
-        if len(counter) == unique_count:
-            return i + unique_count
-        counter.update(c)
-        counter[code[i]] -= 1
-        if counter[code[i]] == 0:
-            counter.pop(code[i])
-    raise ValueError("No marker found")
+
+def scan_markers(code: bytes | memoryview, unique_counts: Iterable[int]) -> dict[int, int]:
+    """
+    Finds the first marker of every size in a single pass. A marker of size n ends where the
+    run of distinct bytes leading up to it first reaches n, and the run starts just after the
+    last earlier occurrence of any byte in it, so a last-seen index per byte value is enough.
+    :param code:
+    :param unique_counts: Marker sizes
+    :return: Position just past the first marker of each size that has one
+    """
+    pending = sorted(set(unique_counts), reverse=True)
+    found = {}
+    if not pending:
+        return found
+    last_seen = [-1] * 256
+    # The run of distinct bytes ending at i starts here
+    start = 0
+    for i, c in enumerate(code):
+        if last_seen[c] >= start:
+            start = last_seen[c] + 1
+        last_seen[c] = i
+        # The run grows by at most one byte per step, so each size is hit exactly
+        if i - start + 1 == pending[-1]:
+            found[pending.pop()] = i + 1
+            if not pending:
+                break
+    return found
+
+
+def find_markers(code: bytes | memoryview, unique_counts: Iterable[int]) -> list[int]:
+    """
+    :param code:
+    :param unique_counts: Marker sizes
+    :return: Position just past the first marker of each size, in the order given
+    """
+    unique_counts = list(unique_counts)
+    found = scan_markers(code, unique_counts)
+    if len(found) < len(set(unique_counts)):
+        raise ValueError("No marker found")
+    return [found[unique_count] for unique_count in unique_counts]
+
+
+def find_first_marker(code: str | bytes | memoryview, unique_count: int) -> int:
+    if isinstance(code, str):
+        code = code.encode()
+    return find_markers(code, [unique_count])[0]
+
+
+def chunk_ranges(size: int, chunks: int, overlap: int) -> list[tuple[int, int]]:
+    """
+    Splits a buffer into roughly equal byte ranges, each extended by the overlap into the next
+    one so that every window of overlap + 1 bytes lies entirely within some range.
+    :param size:
+    :param chunks:
+    :param overlap:
+    :return: (start, end) byte offsets; end is exclusive
+    """
+    boundaries = [size * i // chunks for i in range(chunks + 1)]
+    return [
+        (start, min(end + overlap, size))
+        for start, end in zip(boundaries, boundaries[1:])
+        if start < end
+    ]
+
+
+def range_markers(filename: str, start: int, end: int, unique_counts: tuple[int, ...]) -> dict[int, int]:
+    with open(filename, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view, view[start:end] as code:
+                found = scan_markers(code, unique_counts)
+    return {unique_count: start + position for unique_count, position in found.items()}
+
+
+def parallel_find_markers(filename: str, unique_counts: Iterable[int], jobs: int | None = None) -> list[int]:
+    """
+    find_markers() over overlapping byte ranges of the file in a process pool, for very large
+    signals. Every worker maps the same file, so the pages are shared rather than copied.
+    :param filename:
+    :param unique_counts: Marker sizes
+    :param jobs: Worker processes and chunks; None uses every CPU
+    :return: Position just past the first marker of each size, in the order given
+    """
+    # A puzzle-sized signal is searched in place by run(), so only huge ones load the pool machinery
+    from concurrent.futures import ProcessPoolExecutor
+
+    unique_counts = list(unique_counts)
+    jobs = jobs or os.cpu_count()
+    with map_line(filename) as encoding:
+        size = len(encoding)
+    ranges = chunk_ranges(size, jobs, max(unique_counts, default=1) - 1)
+    starts = [start for start, _ in ranges]
+    ends = [end for _, end in ranges]
+
+    found = {}
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        # A marker found in one chunk ends before any marker can end in a later one,
+        # so the first chunk to find a size has its smallest position
+        for markers in executor.map(range_markers, repeat(filename), starts, ends, repeat(tuple(unique_counts))):
+            for unique_count, position in markers.items():
+                found.setdefault(unique_count, position)
+            if len(found) == len(set(unique_counts)):
+                # Waits for the chunks already running, so no worker outlives the call
+                executor.shutdown(cancel_futures=True)
+                break
+
+    if len(found) < len(set(unique_counts)):
+        raise ValueError("No marker found")
+    return [found[unique_count] for unique_count in unique_counts]
+
+
+def run(filename: str, jobs: int = 1) -> None:
+    # Both parts come out of the same pass
+    with phase("search"):
+        if jobs == 1:
+            with map_line(filename) as encoding:
+                packet, message = find_markers(encoding, (4, 14))
+        else:
+            packet, message = parallel_find_markers(filename, (4, 14), jobs)
+    print(packet)
+    print(message)
 
 
 if __name__ == '__main__':
-    with open("input.txt", "r", encoding="utf-8") as f:
-        encoding = f.readline().strip()
-    print(find_first_marker(encoding, 4))
-    print(find_first_marker(encoding, 14))
+    with recording() as report, profiling("06", "--profile" in sys.argv):
+        run(day_input(__file__, "input.txt"))
+    print(report)
@@ -1,70 +1,296 @@
 from __future__ import annotations
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass, field
-from itertools import chain
+from itertools import accumulate
+from typing import Iterable, Iterator
+
+from days.common.inputs import day_input, read_lines
+from days.common.instrument import phase, profiling, recording
+
+
+@dataclass
+class SizeChange:
+    directory: Directory
+    before: int
+    after: int
+
+    def __str__(self) -> str:
+        return f"{self.directory.path}: {self.before} -> {self.after}"
 
 
 @dataclass
+class SizeWatch:
+    """
+    Change feed of the directories whose total size moves across the threshold, either way.
+    """
+    threshold: int
+    changes: list[SizeChange] = field(default_factory=list)
+
+    def crossed(self, before: int, after: int) -> bool:
+        return (before >= self.threshold) != (after >= self.threshold)
+
+    def drain(self) -> list[SizeChange]:
+        changes, self.changes = self.changes, []
+        return changes
+
+
+@dataclass(eq=False)
 class Directory:
     parent: Directory | None = None
     directories: dict[str, Directory] = field(default_factory=dict)
     files: dict[str, int] = field(default_factory=dict)
     total_size: int = 0
+    name: str = "/"
+    # Only used on the root, which sees every size change on its way up
+    watches: list[SizeWatch] = field(default_factory=list, repr=False)
+
+    @property
+    def path(self) -> str:
+        names = []
+        directory = self
+        while directory.parent is not None:
+            names.append(directory.name)
+            directory = directory.parent
+        return "/" + "/".join(reversed(names))
 
     def add_directory(self, name: str) -> None:
-        self.directories[name] = Directory(parent=self)
+        # Listing a directory again must not throw away what is already known about it
+        if name not in self.directories:
+            self.directories[name] = Directory(parent=self, name=name)
 
     def add_file(self, name: str, size: int) -> None:
+        """
+        Adds the file, or replaces the one already listed under its name, and updates the total
+        size of every directory it is in.
+        :param name:
+        :param size:
+        :return:
+        """
+        previous = self.files.get(name, 0)
         self.files[name] = size
-        self.update_size(size)
+        if size != previous:
+            self.update_size(size - previous)
+
+    def remove_file(self, name: str) -> int:
+        size = self.files.pop(name)
+        if size:
+            self.update_size(-size)
+        return size
+
+    def remove_directory(self, name: str) -> Directory:
+        directory = self.directories.pop(name)
+        if directory.total_size:
+            self.update_size(-directory.total_size)
+        return directory
 
     def update_size(self, size: int) -> None:
-        self.total_size += size
-        if self.parent:
-            self.parent.update_size(size)
-
-
-def process_lines(command: str, lines: list[str], current: Directory) -> None:
-    match command.split():
-        case ["$", "cd", "/"]:
-            d = current
-            while d.parent:
-                d = d.parent
-            return process_lines(lines[0], lines[1:], d)
-        case ["$", "cd", ".."]:
-            return process_lines(lines[0], lines[1:], current.parent)
-        case ["$",  "cd", target_dir]:
-            return process_lines(lines[0], lines[1:], current.directories[target_dir])
-        case ["$", "ls"]:
-            for index, line in enumerate(lines):
-                if line.startswith("$"):
-                    return process_lines(lines[index], lines[index+1:], current)
-                match line.split():
-                    case ["dir", name]:
-                        current.add_directory(name)
-                    case [size, name]:
-                        current.add_file(name, int(size))
-        case _:
-            raise ValueError(f"Command not recognized: {command}")
-
-
-def sum_directories_under_limit(directory: Directory, limit: int) -> int:
-    size = directory.total_size if directory.total_size <= limit else 0
-    return size + sum([sum_directories_under_limit(child, limit) for child in directory.directories.values()])
-
-
-def find_directories_to_delete(current: Directory, needed_space: int) -> list[int]:
-    sizes = [current.total_size] if current.total_size >= needed_space else []
-    sizes += list(chain(*[find_directories_to_delete(child, needed_space) for child in current.directories.values()]))
-    return sizes
+        """
+        Adds to the total size of this directory and all its ancestors, reporting every one that
+        crosses a threshold to the watches on the root.
+        :param size: Change in size, negative for a shrink
+        :return:
+        """
+        befores = []
+        directory = self
+        while True:
+            befores.append((directory, directory.total_size))
+            directory.total_size += size
+            if directory.parent is None:
+                break
+            directory = directory.parent
+
+        for watch in directory.watches:
+            for changed, before in befores:
+                if watch.crossed(before, changed.total_size):
+                    watch.changes.append(SizeChange(changed, before, changed.total_size))
+
+    def root(self) -> Directory:
+        directory = self
+        while directory.parent is not None:
+            directory = directory.parent
+        return directory
+
+    def watch(self, threshold: int) -> SizeWatch:
+        """
+        Starts a change feed for the whole tree this directory belongs to.
+        :param threshold:
+        :return:
+        """
+        watch = SizeWatch(threshold)
+        self.root().watches.append(watch)
+        return watch
+
+    def walk(self) -> Iterator[Directory]:
+        """
+        This directory and every one below it, parents before their children.
+        :return:
+        """
+        stack = [self]
+        while stack:
+            directory = stack.pop()
+            yield directory
+            stack.extend(directory.directories.values())
+
+
+def accumulate_sizes(root: Directory) -> None:
+    """
+    Sets the total size of every directory from the files directly in it, children first.
+    :param root:
+    :return:
+    """
+    for directory in reversed(list(root.walk())):
+        directory.total_size = sum(directory.files.values()) + sum(
+            child.total_size for child in directory.directories.values()
+        )
+
+
+def prune_listing(directory: Directory, listed: set[str], incremental: bool) -> None:
+    """
+    Drops the files and directories that an ls of the directory no longer shows.
+    :param directory:
+    :param listed: Every name the ls showed
+    :param incremental: Take the sizes out of the totals right away
+    :return:
+    """
+    for name in [name for name in directory.files if name not in listed]:
+        if incremental:
+            directory.remove_file(name)
+        else:
+            del directory.files[name]
+    for name in [name for name in directory.directories if name not in listed]:
+        if incremental:
+            directory.remove_directory(name)
+        else:
+            del directory.directories[name]
+
+
+def parse_log(lines: Iterable[str], root: Directory | None = None) -> Directory:
+    """
+    Rebuilds the filesystem from a terminal log in a single pass, keeping the path to the
+    current directory on a stack.
+    :param lines:
+    :param root: A tree from an earlier session to replay this one onto; totals are updated as
+        the log is read, and an ls replaces what was known about the directory, so entries it no
+        longer shows are removed
+    :return: The root directory, with total sizes filled in
+    """
+    incremental = root is not None
+    if root is None:
+        root = Directory()
+    path = [root]
+    # The directory being listed and the names listed so far
+    listing: tuple[Directory, set[str]] | None = None
+    for line in lines:
+        if listing and line.startswith("$"):
+            prune_listing(*listing, incremental)
+            listing = None
+        match line.split():
+            case ["$", "cd", "/"]:
+                del path[1:]
+            case ["$", "cd", ".."]:
+                if len(path) > 1:
+                    path.pop()
+            case ["$", "cd", target_dir]:
+                path.append(path[-1].directories[target_dir])
+            case ["$", "ls"]:
+                listing = (path[-1], set())
+            case []:
+                pass
+            case ["dir", name]:
+                path[-1].add_directory(name)
+                if listing:
+                    listing[1].add(name)
+            case [size, name] if size.isdigit():
+                if listing:
+                    listing[1].add(name)
+                if incremental:
+                    path[-1].add_file(name, int(size))
+                else:
+                    # Totals are filled in once at the end rather than per file
+                    path[-1].files[name] = int(size)
+            case _:
+                raise ValueError(f"Command not recognized: {line}")
+    if listing:
+        prune_listing(*listing, incremental)
+
+    if not incremental:
+        accumulate_sizes(root)
+    return root
+
+
+@dataclass
+class DirectoryTable:
+    """
+    Every directory of a parsed tree as one row, parents before children, plus the total sizes
+    in ascending order with their running sums, so size questions are binary searches.
+    """
+    parents: array
+    sizes: array
+    paths: list[str]
+    sorted_sizes: array
+    # prefix_sums[i] is the sum of the i smallest sizes
+    prefix_sums: array
+
+    @classmethod
+    def from_tree(cls, root: Directory) -> DirectoryTable:
+        parents = array("q")
+        sizes = array("q")
+        paths = []
+        stack = [(root, -1, "/")]
+        while stack:
+            directory, parent, path = stack.pop()
+            index = len(paths)
+            parents.append(parent)
+            sizes.append(directory.total_size)
+            paths.append(path)
+            stack.extend(
+                (child, index, f"{path.rstrip('/')}/{name}") for name, child in directory.directories.items()
+            )
+
+        sorted_sizes = array("q", sorted(sizes))
+        return cls(parents, sizes, paths, sorted_sizes, array("q", accumulate(sorted_sizes, initial=0)))
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    @property
+    def total_size(self) -> int:
+        return self.sizes[0]
+
+    def sum_at_most(self, limit: int) -> int:
+        """
+        Sum of the total sizes of all directories no larger than the limit.
+        :param limit:
+        :return:
+        """
+        return self.prefix_sums[bisect_right(self.sorted_sizes, limit)]
+
+    def smallest_at_least(self, needed_space: int) -> int:
+        """
+        Size of the smallest directory that would free the needed space if deleted.
+        :param needed_space:
+        :return:
+        """
+        index = bisect_left(self.sorted_sizes, needed_space)
+        if index == len(self.sorted_sizes):
+            raise ValueError(f"No directory is {needed_space} or larger")
+        return self.sorted_sizes[index]
+
+
+def run(filename: str) -> None:
+    with phase("parse"):
+        table = DirectoryTable.from_tree(parse_log(read_lines(filename)))
+    with phase("part 1"):
+        print(table.sum_at_most(100000))
+    with phase("part 2"):
+        free_space = (70000000 - table.total_size)
+        needed_space_ = 30000000 - free_space
+        print(table.smallest_at_least(needed_space_))
 
 
 if __name__ == '__main__':
-    with open("input.txt", "r", encoding="utf-8") as f:
-        lines_ = [line.rstrip() for line in f.readlines()]
-
-    root = Directory()
-    process_lines(lines_[0], lines_[1:], root)
-    print(sum_directories_under_limit(root, 100000))
-    free_space = (70000000 - root.total_size)
-    needed_space_ = 30000000 - free_space
-    print(min(find_directories_to_delete(root, needed_space_)))
+    with recording() as report, profiling("07", "--profile" in sys.argv):
+        run(day_input(__file__, "input.txt"))
+    print(report)
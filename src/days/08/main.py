@@ -1,88 +1,100 @@
 from __future__ import annotations
 
-import time
-from dataclasses import dataclass
-from enum import Enum, auto
-
-
-class Direction(Enum):
-    UP = auto()
-    LEFT = auto()
-    DOWN = auto()
-    RIGHT = auto()
-
-
-@dataclass(frozen=True)
-class Coord:
-    x: int
-    y: int
-
-    def move(self, direction: Direction) -> Coord:
-        match direction:
-            case Direction.UP:
-                return Coord(self.x, self.y - 1)
-            case Direction.DOWN:
-                return Coord(self.x, self.y + 1)
-            case Direction.LEFT:
-                return Coord(self.x - 1, self.y)
-            case Direction.RIGHT:
-                return Coord(self.x + 1, self.y)
-
-    def is_out_of_bounds(self, max_x:int, max_y: int) -> bool:
-        return self.x < 0 or self.x >= max_x or self.y < 0 or self.y >= max_y
-
-
-def is_visible(trees: list[list[int]], coord: Coord) -> bool:
-    min_max = None
-    for direction in Direction:
-        next_ = coord.move(direction)
-        max_direction = -1
-        while not next_.is_out_of_bounds(len(trees), len(trees[0])):
-            max_direction = max(max_direction, trees[next_.x][next_.y])
-            next_ = next_.move(direction)
-        min_max = min(min_max, max_direction) if min_max is not None else max_direction
-
-    return trees[coord.x][coord.y] > min_max
-
-
-def total_visible_trees(trees: list[list[int]]) -> int:
-    total = 0
-    for x, row in enumerate(trees_):
-        for y, tree in enumerate(row):
-            total += 1 if is_visible(trees, Coord(x, y)) else 0
-
-    return total
-
-
-def calculate_scenic_score(trees: list[list[int]], coord: Coord) -> int:
-    tree = trees[coord.x][coord.y]
+import sys
+
+from days.common.grid import Grid2D
+from days.common.inputs import day_input, read_lines
+from days.common.instrument import phase, profiling, recording
+
+# Taller than any tree, so walking off the forest stops every scan
+EDGE = 10
+TALLEST = 9
+HEIGHTS = {str(height): height for height in range(10)}
+
+
+def is_visible(trees: Grid2D, index: int) -> bool:
+    cells = trees.cells
+    tree = cells[index]
+    for offset in trees.offsets4:
+        next_ = index + offset
+        while cells[next_] < tree:
+            next_ += offset
+        if cells[next_] == EDGE:
+            return True
+    return False
+
+
+def visible_trees(trees: Grid2D) -> bytearray:
+    """
+    Marks every tree visible from outside the forest with four sweeps, one per direction, along
+    every row and column. A tree is visible from where a sweep starts if it is taller than
+    everything the sweep has passed so far.
+    :param trees:
+    :return: 1 at the index of every visible tree, 0 elsewhere
+    """
+    cells = trees.cells
+    visible = bytearray(len(cells))
+    rows = range(trees.height)
+    columns = range(trees.width)
+    sweeps = (
+        ([trees.index(0, y) for y in rows], 1),
+        ([trees.index(trees.width - 1, y) for y in rows], -1),
+        ([trees.index(x, 0) for x in columns], trees.stride),
+        ([trees.index(x, trees.height - 1) for x in columns], -trees.stride),
+    )
+    for starts, step in sweeps:
+        for index in starts:
+            tallest = -1
+            while (tree := cells[index]) != EDGE:
+                if tree > tallest:
+                    visible[index] = 1
+                    tallest = tree
+                    # Nothing further along can be seen past the tallest possible tree
+                    if tree == TALLEST:
+                        break
+                index += step
+    return visible
+
+
+def total_visible_trees(trees: Grid2D) -> int:
+    return visible_trees(trees).count(1)
+
+
+def calculate_scenic_score(trees: Grid2D, index: int) -> int:
+    cells = trees.cells
+    tree = cells[index]
     score = 1
-    for direction in Direction:
-        next_ = coord.move(direction)
+    for offset in trees.offsets4:
+        next_ = index + offset
         direction_score = 0
-        while not next_.is_out_of_bounds(len(trees), len(trees[0])):
+        while cells[next_] != EDGE:
             direction_score += 1
-            if tree <= trees[next_.x][next_.y]:
+            if tree <= cells[next_]:
                 break
-            next_ = next_.move(direction)
+            next_ += offset
         score *= direction_score
 
     return score
 
 
-def highest_scenic_score(trees: list[list[int]]) -> int:
+def highest_scenic_score(trees: Grid2D) -> int:
     highest = -1
-    for x, row in enumerate(trees_):
-        for y, tree in enumerate(row):
-            highest = max(highest, calculate_scenic_score(trees, Coord(x, y)))
+    for index in trees.indices():
+        highest = max(highest, calculate_scenic_score(trees, index))
 
     return highest
 
 
+def run(filename: str) -> None:
+    with phase("parse"):
+        trees_ = Grid2D.from_lines(list(read_lines(filename)), HEIGHTS, border=EDGE)
+    with phase("part 1"):
+        print(f"Visible trees: {total_visible_trees(trees_)}")
+    with phase("part 2"):
+        print(f"Highest Scenic Score: {highest_scenic_score(trees_)}")
+
+
 if __name__ == '__main__':
-    with open("input.txt", "r", encoding="utf-8") as f:
-        trees_ = [[int(tree) for tree in line.rstrip()] for line in f.readlines()]
-    start = time.time()
-    print(f"Visible trees: {total_visible_trees(trees_)}")
-    print(f"Highest Scenic Score: {highest_scenic_score(trees_)}")
-    print(f"Time to execute: {time.time() - start}")
+    with recording() as report, profiling("08", "--profile" in sys.argv):
+        run(day_input(__file__, "input.txt"))
+    print(report)
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-import time
+import importlib
+import sys
 from dataclasses import dataclass
 from enum import Enum
 
-import textual
-from textual.app import App
+from days.common.coord import ORIGIN, Coord
+from days.common.inputs import day_input, read_lines
+from days.common.instrument import phase, profiling, recording
 
 
 class Direction(Enum):
@@ -19,35 +21,16 @@ class Direction(Enum):
     RIGHT = "R"
 
 
-@dataclass(frozen=True)
-class Coord:
-    x: int
-    y: int
-
-    def copy(self) -> Coord:
-        return Coord(self.x, self.y)
-
-    def move(self, direction: Direction) -> Coord:
-        match direction:
-            case Direction.UP:
-                return Coord(self.x, self.y + 1)
-            case Direction.UP_LEFT:
-                return Coord(self.x - 1, self.y + 1)
-            case Direction.LEFT:
-                return Coord(self.x - 1, self.y)
-            case Direction.DOWN_LEFT:
-                return Coord(self.x - 1, self.y - 1)
-            case Direction.DOWN:
-                return Coord(self.x, self.y - 1)
-            case Direction.DOWN_RIGHT:
-                return Coord(self.x + 1, self.y - 1)
-            case Direction.RIGHT:
-                return Coord(self.x + 1, self.y)
-            case Direction.UP_RIGHT:
-                return Coord(self.x + 1, self.y + 1)
-
-    def is_touching(self, other: Coord) -> bool:
-        return abs(self.x - other.x) <= 1 and abs(self.y - other.y) <= 1
+MOVES = {
+    Direction.UP: Coord(0, 1),
+    Direction.UP_LEFT: Coord(-1, 1),
+    Direction.LEFT: Coord(-1, 0),
+    Direction.DOWN_LEFT: Coord(-1, -1),
+    Direction.DOWN: Coord(0, -1),
+    Direction.DOWN_RIGHT: Coord(1, -1),
+    Direction.RIGHT: Coord(1, 0),
+    Direction.UP_RIGHT: Coord(1, 1),
+}
 
 
 @dataclass
@@ -58,7 +41,7 @@ class Knot:
     next: Knot | None = None
 
     def move(self, direction: Direction) -> None:
-        self.position = self.position.move(direction)
+        self.position = self.position + MOVES[direction]
         if not self.is_tail:
             self.next.follow()
 
@@ -99,22 +82,22 @@ class Knot:
 class Rope:
     head: Knot
     tail: Knot
-    tail_positions: list[Coord]
+    tail_positions: set[Coord]
 
     def __init__(self, knots: int) -> None:
-        self.head = Knot(id=0, position=Coord(0, 0))
+        self.head = Knot(id=0, position=ORIGIN)
         knot = self.head
         for i in range(knots - 1):
-            knot.next = Knot(i + 1, Coord(0, 0))
+            knot.next = Knot(i + 1, ORIGIN)
             knot.next.prev = knot
             knot = knot.next
         self.tail = knot
-        self.tail_positions = [Coord(0, 0)]
+        self.tail_positions = {ORIGIN}
 
     def move_head(self, direction: Direction, distance: int) -> None:
         for _ in range(distance):
             self.head.move(direction)
-            self.tail_positions.append(self.tail.position.copy())
+            self.tail_positions.add(self.tail.position)
 
     @property
     def knot_positions(self) -> list[Knot]:
@@ -126,23 +109,23 @@ class Rope:
         return knots
 
 
-def draw(rope: Rope) -> None:
-    pass
-
-
-class RopeApp(App):
-    pass
+def run(filename: str, visualize: bool = False) -> None:
+    # textual is only imported when a visualization is asked for
+    draw = importlib.import_module("days.09.visualize").draw if visualize else None
+    with phase("parse"):
+        moves_ = list(read_lines(filename))
+    with phase("part 2"):
+        rope_ = Rope(10)
+        for move in moves_:
+            direction_, distance_ = move.split()
+            if draw:
+                draw(rope_)
+            rope_.move_head(Direction(direction_), int(distance_))
+        unique_positions = len(rope_.tail_positions)
+    print(f"Unique Tail Position: {unique_positions}")
 
 
 if __name__ == '__main__':
-    with open("input.txt", "r", encoding="utf-8") as f:
-        moves_ = [line.rstrip() for line in f.readlines()]
-    start = time.time()
-    rope_ = Rope(10)
-    for move in moves_:
-        direction_, distance_ = move.split()
-        draw(rope_)
-        rope_.move_head(Direction(direction_), int(distance_))
-    unique_positions = len(set(rope_.tail_positions))
-    # print(f"Unique Tail Position: {unique_positions}")
-    # print(f"Time to execute: {time.time() - start}")
+    with recording() as report, profiling("09", "--profile" in sys.argv):
+        run(day_input(__file__, "input.txt"), visualize="--visualize" in sys.argv)
+    print(report)
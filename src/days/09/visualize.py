@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from textual.app import App
+
+if TYPE_CHECKING:
+    # main.py imports this module only when visualizing, so it is never imported back at runtime
+    from .main import Rope
+
+
+def draw(rope: Rope) -> None:
+    pass
+
+
+class RopeApp(App):
+    pass
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-import time
+import sys
+
+from days.common.inputs import day_input, read_lines
+from days.common.instrument import phase, profiling, recording
 
 
 def render_image(raster: list[bool]) -> str:
@@ -58,12 +61,18 @@ def calculate_signal_strength(commands: list[str]) -> int:
     return signal_strength
 
 
-if __name__ == '__main__':
-    with open("input.txt", "r", encoding="utf-8") as f:
-        commands_ = [line.rstrip() for line in f.readlines()]
-    signal_strength_ = calculate_signal_strength(commands_)
+def run(filename: str) -> None:
+    with phase("parse"):
+        commands_ = list(read_lines(filename))
+    with phase("part 1"):
+        signal_strength_ = calculate_signal_strength(commands_)
     print(f"Signal Strength: {signal_strength_}")
-    raster_ = process_image(commands_)
+    with phase("part 2"):
+        raster_ = process_image(commands_)
     print(render_image(raster_))
-    start = time.time()
-    print(f"Time to execute: {time.time() - start}")
+
+
+if __name__ == '__main__':
+    with recording() as report, profiling("10", "--profile" in sys.argv):
+        run(day_input(__file__, "input.txt"))
+    print(report)
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import math
+import sys
 from dataclasses import  dataclass
-import time
+
+from days.common.inputs import day_input, read_lines
+from days.common.instrument import phase, profiling, recording
 
 
 @dataclass
@@ -75,14 +78,15 @@ def calculate_monkey_business(monkeys: list[Monkey], rounds: int) -> int:
     return monkey_activity[-1] * monkey_activity[-2]
 
 
-def run() -> None:
-    with open("input.txt", "r", encoding="utf-8") as f:
-        lines = [line.rstrip() for line in f.readlines()]
-    monkeys = gen_monkeys(lines)
-    print(calculate_monkey_business(monkeys, 10000))
+def run(filename: str, rounds: int = 10000) -> None:
+    with phase("parse"):
+        lines = list(read_lines(filename))
+        monkeys = gen_monkeys(lines)
+    with phase("part 2"):
+        print(calculate_monkey_business(monkeys, rounds))
 
 
 if __name__ == '__main__':
-    start = time.time()
-    run()
-    print(f"Time to execute: {time.time() - start}")
+    with recording() as report, profiling("11", "--profile" in sys.argv):
+        run(day_input(__file__, "input.txt"))
+    print(report)
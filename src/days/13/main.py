@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import builtins
-import time
+import sys
+
+from days.common.inputs import day_input, read_lines
+from days.common.instrument import phase, profiling, recording
 
 
 def is_correct(first_packet: list[int | str], second_packet: list[int | str]) -> tuple[bool, bool]:
@@ -81,25 +84,27 @@ def find_decoder_key(packets: list[Packet]) -> int:
 
 
 def run(filename: str) -> None:
-    with open(filename, "r", encoding="utf-8") as f:
-        lines = [line.rstrip() for line in f.readlines()]
+    with phase("parse"):
+        lines = list(read_lines(filename))
         packet_pairs = []
         for i in range(0, len(lines), 3):
             packet_pairs.append((eval(lines[i]), eval(lines[i + 1])))
     print(f"File: {filename}")
-    print(f"Correct pairs: {count_correct_pairs(packet_pairs)}")
+    with phase("part 1"):
+        print(f"Correct pairs: {count_correct_pairs(packet_pairs)}")
 
-    packets = [Packet(list(list([2]))), Packet(list(list([6])))]
-    for pair in packet_pairs:
-        packets.append(Packet(pair[0]))
-        packets.append(Packet(pair[1]))
+    with phase("part 2"):
+        packets = [Packet(list(list([2]))), Packet(list(list([6])))]
+        for pair in packet_pairs:
+            packets.append(Packet(pair[0]))
+            packets.append(Packet(pair[1]))
 
-    print(f"Decoder key: {find_decoder_key(packets)}")
+        print(f"Decoder key: {find_decoder_key(packets)}")
     print()
 
 
 if __name__ == '__main__':
-    start = time.time()
-    run("example.txt")
-    run("input.txt")
-    print(f"Time to execute: {time.time() - start}")
+    with recording() as report, profiling("13", "--profile" in sys.argv):
+        run(day_input(__file__, "example.txt"))
+        run(day_input(__file__, "input.txt"))
+    print(report)
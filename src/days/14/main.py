@@ -1,15 +1,27 @@
 from __future__ import annotations
 
-import time
+import sys
 from dataclasses import dataclass
-from enum import Enum
+from enum import IntEnum
 
+from days.common.grid import Grid2D
+from days.common.inputs import day_input, read_lines
+from days.common.instrument import phase, profiling, recording
 
-class Material(Enum):
-    AIR = "."
-    STONE = "#"
-    SAND = "o"
-    VOID = "~"
+
+class Material(IntEnum):
+    AIR = 0
+    STONE = 1
+    SAND = 2
+    VOID = 3
+
+
+SYMBOLS = {
+    Material.AIR: ".",
+    Material.STONE: "#",
+    Material.SAND: "o",
+    Material.VOID: "~",
+}
 
 
 @dataclass
@@ -25,7 +37,7 @@ class Coord:
 class Cave:
     top_right: Coord
     bottom_left: Coord
-    grid: list[list[Material]]
+    grid: Grid2D
 
     def __init__(self, structures: list[list[Coord]]) -> None:
         coords = []
@@ -34,9 +46,8 @@ class Cave:
         self.top_right = Coord(max(*coords, key=lambda coord: coord.x).x, 0)
         self.bottom_left = Coord(min(*coords, key=lambda coord: coord.x).x, max(*coords, key=lambda coord: coord.y).y)
 
-        self.grid = []
-        for _ in range(self.bottom_left.y + 1 + 2):
-            self.grid.append([Material.AIR for _ in range(self.top_right.x * 2 + 1)])
+        # Anything falling off the sides lands in the VOID padding
+        self.grid = Grid2D(self.top_right.x * 2 + 1, self.bottom_left.y + 1 + 2, Material.AIR, border=Material.VOID)
 
         for structure in structures:
             for first, second in zip(structure, structure[1:]):
@@ -47,42 +58,44 @@ class Cave:
                     for y in range(min(first.y, second.y), max(first.y, second.y) + 1):
                         self._set_material(Coord(first.x, y), Material.STONE)
 
-        for x in range(len(self.grid[0])):
-            self._set_material(Coord(x, len(self.grid) - 1), Material.STONE)
+        floor = self.grid.index(0, self.grid.height - 1)
+        self.grid.cells[floor:floor + self.grid.width] = bytes([Material.STONE]) * self.grid.width
 
     def _set_material(self, coord: Coord, material: Material) -> None:
-        self.grid[coord.y][coord.x] = material
+        self.grid.set(coord.x, coord.y, material)
 
     def _get_material(self, coord: Coord) -> Material:
-        # Enable for VOID
-        # if not self.bottom_left.x <= coord.x <= self.top_right.x or not self.top_right.y <= coord.y <= self.bottom_left.y:
-        #     return Material.VOID
-        return self.grid[coord.y][coord.x]
+        return Material(self.grid.get(coord.x, coord.y))
 
     def __str__(self) -> str:
         out = ""
-        for row in self.grid:
-            for material in row:
-                out += material.value
+        for y in range(self.grid.height):
+            for material in self.grid.row(y):
+                out += SYMBOLS[material]
             out += "\n"
         return out
 
     def drop_sand(self, source: Coord) -> bool:
-        directions = [Coord(0, 1), Coord(-1, 1), Coord(1, 1)]
-        current = source
+        cells = self.grid.cells
+        stride = self.grid.stride
+        # down, down left, down right
+        directions = (stride, stride - 1, stride + 1)
+        air, void = Material.AIR.value, Material.VOID.value
+        start = current = self.grid.index(source.x, source.y)
         can_move = True
         while can_move:
             can_move = False
             for direction in directions:
-                if self._get_material(current.move(direction)) == Material.VOID:
+                material = cells[current + direction]
+                if material == void:
                     return False
 
-                if self._get_material(current.move(direction)) == Material.AIR:
-                    current = current.move(direction)
+                if material == air:
+                    current += direction
                     can_move = True
                     break
-        self._set_material(current, Material.SAND)
-        if current == source:
+        cells[current] = Material.SAND
+        if current == start:
             return False
         return True
 
@@ -96,21 +109,22 @@ def parse_structure(lines: list[str]) -> list[list[Coord]]:
 
 
 def run(filename: str) -> None:
-    with open(filename, "r", encoding="utf-8") as f:
-        lines = [line.rstrip() for line in f.readlines()]
-    print(f"File: {filename}")
-
-    coords = parse_structure(lines)
-    cave = Cave(coords)
-    count = 1
-    while cave.drop_sand(Coord(500, 0)):
-        count += 1
+    with phase("parse"):
+        lines = list(read_lines(filename))
+        print(f"File: {filename}")
+
+        coords = parse_structure(lines)
+        cave = Cave(coords)
+    with phase("part 2"):
+        count = 1
+        while cave.drop_sand(Coord(500, 0)):
+            count += 1
     print(count)
     print()
 
 
 if __name__ == '__main__':
-    start = time.time()
-    run("example.txt")
-    run("input.txt")
-    print(f"Time to execute: {time.time() - start}")
+    with recording() as report, profiling("14", "--profile" in sys.argv):
+        run(day_input(__file__, "example.txt"))
+        run(day_input(__file__, "input.txt"))
+    print(report)
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import sys
-import time
 from dataclasses import dataclass
 
+from days.common.inputs import day_input, read_ints
+from days.common.instrument import phase, profiling, recording
+
 
 @dataclass(frozen=True)
 class Coord:
@@ -74,39 +76,41 @@ def find_beacon(sensors: list[Sensor], limit: int) -> Coord:
     raise ValueError("No Beacon found")
 
 
-def get_sensors(lines: list[str]) -> list[Sensor]:
+def get_sensors(values: list[int]) -> list[Sensor]:
+    """
+    :param values: Sensor x, sensor y, beacon x, beacon y for every report, flattened
+    :return:
+    """
     sensors = []
 
-    for line in lines:
-        x = int(line[line.find("x=") + 2:line.find(", y")])
-        y = int(line[line.find(", y=") + 4:line.find(": closest beacon")])
-        sensor_loc = Coord(x, y)
-        x = int(line[line.rfind("x=") + 2:line.rfind(", y")])
-        y = int(line[line.rfind("y=") + 2:])
-        sensor = Sensor(sensor_loc, Coord(x, y))
+    for i in range(0, len(values), 4):
+        sensor_x, sensor_y, beacon_x, beacon_y = values[i:i + 4]
+        sensor = Sensor(Coord(sensor_x, sensor_y), Coord(beacon_x, beacon_y))
         sensors.append(sensor)
 
     return sensors
 
 
-def run(filename: str, target_y: int, limit: int) -> None:
-    with open(filename, "r", encoding="utf-8") as f:
-        lines = [line.rstrip() for line in f.readlines()]
-    print(f"File: {filename}")
-    sensors = get_sensors(lines)
-    print(f"Lines covered at y=10: {calculate_total(row_intervals(sensors, target_y))}")
-
-    try:
-        beacon = find_beacon(sensors, limit)
-        print(beacon)
-        print(f"Tuning Frequency: {beacon.x * 4000000 + beacon.y}")
-    except ValueError as e:
-        print(e)
+def run(filename: str, target_y: int = 2000000, limit: int = 4000000) -> None:
+    with phase("parse"):
+        values = read_ints(filename)
+        print(f"File: {filename}")
+        sensors = get_sensors(values)
+    with phase("part 1"):
+        print(f"Lines covered at y=10: {calculate_total(row_intervals(sensors, target_y))}")
+
+    with phase("part 2"):
+        try:
+            beacon = find_beacon(sensors, limit)
+            print(beacon)
+            print(f"Tuning Frequency: {beacon.x * 4000000 + beacon.y}")
+        except ValueError as e:
+            print(e)
     print()
 
 
 if __name__ == '__main__':
-    start = time.time()
-    run("example.txt", 10, 20)
-    run("input.txt", 2000000, 4000000)
-    print(f"Time to execute: {time.time() - start}")
+    with recording() as report, profiling("15", "--profile" in sys.argv):
+        run(day_input(__file__, "example.txt"), 10, 20)
+        run(day_input(__file__, "input.txt"), 2000000, 4000000)
+    print(report)
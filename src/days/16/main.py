@@ -1,9 +1,12 @@
 from __future__ import annotations
 
-import time
+import sys
 from dataclasses import dataclass
 from typing import NewType
 
+from days.common.inputs import day_input, read_lines
+from days.common.instrument import phase, profiling, recording
+
 Minutes = NewType("Minutes", int)
 
 class Valve:
@@ -83,18 +86,19 @@ def calculate_optimal_pressure_release(current: Valve, time_limit: Minutes, valv
 
 
 def run(filename: str) -> None:
-    with open(filename, "r", encoding="utf-8") as f:
-        lines = [line.rstrip() for line in f.readlines()]
-    print(f"File: {filename}")
-    start, valves = parse_valves(lines)
-    print(calculate_optimal_pressure_release(start, Minutes(30), valves, set()))
+    with phase("parse"):
+        lines = list(read_lines(filename))
+        print(f"File: {filename}")
+        start, valves = parse_valves(lines)
+    with phase("part 1"):
+        print(calculate_optimal_pressure_release(start, Minutes(30), valves, set()))
     # solution here
 
     print()
 
 
 if __name__ == '__main__':
-    start_time = time.time()
-    run("example.txt")
-    # run("input.txt")
-    print(f"Time to execute: {time.time() - start_time}")
+    with recording() as report, profiling("16", "--profile" in sys.argv):
+        run(day_input(__file__, "example.txt"))
+        # run(day_input(__file__, "input.txt"))
+    print(report)
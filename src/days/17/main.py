@@ -1,12 +1,15 @@
 from __future__ import annotations
 
-import time
+import sys
 from abc import ABC, abstractmethod
 from collections import defaultdict
-from dataclasses import dataclass
 from enum import Enum, auto
 from itertools import cycle
 
+from days.common.coord import Coord
+from days.common.inputs import day_input, map_line
+from days.common.instrument import phase, profiling, recording
+
 
 class Direction(Enum):
     LEFT = auto()
@@ -14,33 +17,26 @@ class Direction(Enum):
     RIGHT = auto()
 
 
-@dataclass(frozen=True)
-class Coord:
-    x: int
-    y: int
-
-    def __hash__(self) -> int:
-        return hash((self.x, self.y))
-
-    def move(self, direction: Direction) -> Coord:
-        match direction:
-            case Direction.LEFT:
-                return Coord(self.x - 1, self.y)
-            case Direction.RIGHT:
-                return Coord(self.x + 1, self.y)
-            case Direction.DOWN:
-                return Coord(self.x, self.y - 1)
+JETS = {ord("<"): Direction.LEFT, ord(">"): Direction.RIGHT}
+MOVES = {
+    Direction.LEFT: Coord(-1, 0),
+    Direction.RIGHT: Coord(1, 0),
+    Direction.DOWN: Coord(0, -1),
+}
 
 
 class Rock(ABC):
     anchor: Coord
     height: int
+    # Cells of the rock relative to its anchor
+    shape: tuple[Coord, ...]
     positions: set[Coord]
     walls: set[Coord]
 
     def __init__(self, anchor: Coord, height: int) -> None:
         self.anchor = anchor
         self.height = height
+        self.positions = {anchor + offset for offset in self.shape}
         self.walls = set()
         for offset in range(height):
             self.walls.add(Coord(-1, self.anchor.y + offset))
@@ -61,7 +57,7 @@ class Rock(ABC):
         pass
 
     def move(self, direction: Direction, collision_map: dict[int, set[Rock]]) -> Rock | None:
-        next_position = self.create(self.anchor.move(direction))
+        next_position = self.create(self.anchor + MOVES[direction])
         if not self.walls & next_position.positions and next_position.anchor.y >= 0:
             rocks = collision_map[self.anchor.y // 4]
             if not any([rock.will_collide(next_position) for rock in rocks]):
@@ -73,14 +69,10 @@ class Rock(ABC):
 
 
 class HorizontalRock(Rock):
+    shape = (Coord(0, 0), Coord(1, 0), Coord(2, 0), Coord(3, 0))
+
     def __init__(self, anchor: Coord) -> None:
         super().__init__(anchor, 1)
-        self.positions = {
-            self.anchor,
-            Coord(self.anchor.x + 1, self.anchor.y),
-            Coord(self.anchor.x + 2, self.anchor.y),
-            Coord(self.anchor.x + 3, self.anchor.y)
-        }
 
     @classmethod
     def create(cls, anchor: Coord) -> Rock:
@@ -88,14 +80,10 @@ class HorizontalRock(Rock):
 
 
 class VerticalRock(Rock):
+    shape = (Coord(0, 0), Coord(0, 1), Coord(0, 2), Coord(0, 3))
+
     def __init__(self, anchor: Coord) -> None:
         super().__init__(anchor, 4)
-        self.positions = {
-            self.anchor,
-            Coord(self.anchor.x, self.anchor.y + 1),
-            Coord(self.anchor.x, self.anchor.y + 2),
-            Coord(self.anchor.x, self.anchor.y + 3)
-        }
 
     @classmethod
     def create(cls, anchor: Coord) -> Rock:
@@ -103,15 +91,10 @@ class VerticalRock(Rock):
 
 
 class PlusRock(Rock):
+    shape = (Coord(1, 0), Coord(0, 1), Coord(1, 1), Coord(1, 2), Coord(2, 1))
+
     def __init__(self, anchor: Coord) -> None:
         super().__init__(anchor, 3)
-        self.positions = {
-            Coord(self.anchor.x + 1, self.anchor.y),
-            Coord(self.anchor.x, self.anchor.y + 1),
-            Coord(self.anchor.x + 1, self.anchor.y + 1),
-            Coord(self.anchor.x + 1, self.anchor.y + 2),
-            Coord(self.anchor.x + 2, self.anchor.y + 1),
-        }
 
     @classmethod
     def create(cls, anchor: Coord) -> Rock:
@@ -119,14 +102,10 @@ class PlusRock(Rock):
 
 
 class SquareRock(Rock):
+    shape = (Coord(0, 0), Coord(0, 1), Coord(1, 0), Coord(1, 1))
+
     def __init__(self, anchor: Coord) -> None:
         super().__init__(anchor, 2)
-        self.positions = {
-            self.anchor,
-            Coord(self.anchor.x, self.anchor.y + 1),
-            Coord(self.anchor.x + 1, self.anchor.y),
-            Coord(self.anchor.x + 1, self.anchor.y + 1),
-        }
 
     @classmethod
     def create(cls, anchor: Coord) -> Rock:
@@ -134,15 +113,10 @@ class SquareRock(Rock):
 
 
 class ReverseLRock(Rock):
+    shape = (Coord(0, 0), Coord(1, 0), Coord(2, 0), Coord(2, 1), Coord(2, 2))
+
     def __init__(self, anchor: Coord) -> None:
         super().__init__(anchor, 3)
-        self.positions = {
-            self.anchor,
-            Coord(self.anchor.x + 1, self.anchor.y),
-            Coord(self.anchor.x + 2, self.anchor.y),
-            Coord(self.anchor.x + 2, self.anchor.y + 1),
-            Coord(self.anchor.x + 2, self.anchor.y + 2),
-        }
 
     @classmethod
     def create(cls, anchor: Coord) -> Rock:
@@ -202,15 +176,17 @@ def drop_rocks(jetstream: list[Direction], rock_count: int) -> tuple[int, list]:
     return height, steps
 
 
-def run(filename: str) -> None:
-    with open(filename, "r", encoding="utf-8") as f:
-        jetstream = [Direction.LEFT if char == "<" else Direction.RIGHT for char in f.readline().rstrip()]
+def run(filename: str, rock_count: int = 100, dump_steps: bool = False) -> None:
+    with phase("parse"):
+        with map_line(filename) as jets:
+            jetstream = [JETS[jet] for jet in jets]
     print(f"File: {filename}")
-    rock_total = 100
-    final_height, steps = drop_rocks(jetstream, rock_total)
-    out_str = "".join([step[0] + "\n" + str(step[1]) + f", {step[2]}" + "\n\n" for step in steps])
-    with open(f"steps-{rock_total}.txt", "w", encoding="utf-8") as f:
-        f.write(out_str)
+    with phase("part 1"):
+        final_height, steps = drop_rocks(jetstream, rock_count)
+    if dump_steps:
+        out_str = "".join([step[0] + "\n" + str(step[1]) + f", {step[2]}" + "\n\n" for step in steps])
+        with open(f"steps-{rock_count}.txt", "w", encoding="utf-8") as f:
+            f.write(out_str)
     print(final_height)
     # solution here
 
@@ -218,7 +194,7 @@ def run(filename: str) -> None:
 
 
 if __name__ == '__main__':
-    start = time.time()
-    run("example.txt")
-    # run("input.txt")
-    print(f"Time to execute: {time.time() - start}")
+    with recording() as report, profiling("17", "--profile" in sys.argv):
+        run(day_input(__file__, "example.txt"), dump_steps="--dump-steps" in sys.argv)
+        # run(day_input(__file__, "input.txt"))
+    print(report)
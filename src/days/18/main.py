@@ -1,14 +1,24 @@
 from __future__ import annotations
 
-import time
+import sys
 from dataclasses import dataclass
-from enum import Enum, auto
+from enum import IntEnum
 
+from days.common.cache import cached_parse
+from days.common.grid import Grid3D
+from days.common.inputs import day_input, read_ints
+from days.common.instrument import phase, profiling, recording
 
-class Material(Enum):
-    EXTERIOR = auto()
-    LAVA = auto()
-    INTERIOR = auto()
+
+PARSER_VERSION = 1
+
+
+class Material(IntEnum):
+    EXTERIOR = 0
+    LAVA = 1
+    INTERIOR = 2
+    # Padding around the scan
+    OUT_OF_BOUNDS = 3
 
 
 @dataclass(frozen=True)
@@ -33,118 +43,110 @@ def get_dimensions(coords: list[Coord]) -> tuple[int, int, int]:
 
 
 class LavaDropletScan:
-    grid: list[list[list[Material]]]
+    grid: Grid3D
     coords: set[Coord]
     width: int
     height: int
     depth: int
-    neighbors: list[Coord] = [
-        Coord(0, 0, 1),
-        Coord(0, 0, -1),
-        Coord(0, 1, 0),
-        Coord(0, -1, 0),
-        Coord(1, 0, 0),
-        Coord(-1, 0, 0),
-    ]
 
     def __init__(self, coords: list[Coord]) -> None:
         self.width, self.height, self.depth = get_dimensions(coords)
         self.coords = set(coords)
-        self.grid = [
-            [
-                [
-                    Material.EXTERIOR if Coord(x, y, z) not in self.coords else Material.LAVA
-                    for z in range(self.depth + 1)
-                ] for y in range(self.height + 1)
-            ] for x in range(self.width + 1)
-        ]
-        visited = [
-            [
-                [
-                    False for _ in range(self.depth + 1)
-                ] for _ in range(self.height + 1)
-            ] for _ in range(self.width + 1)
-        ]
+        self.grid = Grid3D(
+            self.width + 1, self.height + 1, self.depth + 1, Material.EXTERIOR, border=Material.OUT_OF_BOUNDS
+        )
+        for coord in self.coords:
+            self.grid.set(coord.x, coord.y, coord.z, Material.LAVA)
+        visited = bytearray(len(self.grid.cells))
         for x in range(self.width):
             for y in range(self.height):
                 for z in range(self.depth):
-                    coord = Coord(x, y, z)
-                    if not visited[coord.x][coord.y][coord.z] and self.is_enclosed(coord, visited):
-                        self.set_enclosed(coord)
+                    index = self.grid.index(x, y, z)
+                    if not visited[index] and self.is_enclosed(index, visited):
+                        self.set_enclosed(index)
 
-    def is_enclosed(self, coord: Coord, visited: list[list[list[bool]]]) -> bool:
-        stack = list()
-        stack.append(coord)
+    def is_enclosed(self, index: int, visited: bytearray) -> bool:
+        cells = self.grid.cells
+        offsets = self.grid.offsets6
+        stack = [index]
 
         enclosed = True
         while stack:
             current = stack.pop()
+            material = cells[current]
 
-            if not self.in_bounds(current):
+            if material == Material.OUT_OF_BOUNDS:
                 enclosed = False
                 continue
 
-            if visited[current.x][current.y][current.z] or self.get_material(current) == Material.LAVA:
+            if visited[current] or material == Material.LAVA:
                 continue
 
-            visited[current.x][current.y][current.z] = True
+            visited[current] = True
 
-            for neighbor in self.neighbors:
-                stack.append(current + neighbor)
+            for offset in offsets:
+                stack.append(current + offset)
 
         return enclosed
 
-    def set_enclosed(self, coord: Coord) -> None:
-        stack = list()
-        stack.append(coord)
+    def set_enclosed(self, index: int) -> None:
+        stack = [index]
 
         while stack:
             current = stack.pop()
 
-            if self.get_material(coord) in {Material.LAVA, Material.INTERIOR}:
+            if self.grid[index] in {Material.LAVA, Material.INTERIOR}:
                 continue
 
-            self.grid[coord.x][coord.y][coord.z] = Material.INTERIOR
+            self.grid[index] = Material.INTERIOR
 
-            for neighbor in self.neighbors:
-                stack.append(current + neighbor)
+            for offset in self.grid.offsets6:
+                stack.append(current + offset)
 
     def in_bounds(self, coord: Coord) -> bool:
         return 0 <= coord.x <= self.width and 0 <= coord.y <= self.height and 0 <= coord.z <= self.depth
 
     def get_material(self, coord: Coord) -> Material:
         if self.in_bounds(coord):
-            return self.grid[coord.x][coord.y][coord.z]
+            return Material(self.grid.get(coord.x, coord.y, coord.z))
         return Material.EXTERIOR
 
     @property
     def surface_area(self) -> int:
+        cells = self.grid.cells
+        offsets = self.grid.offsets6
+        solid = {Material.LAVA.value, Material.INTERIOR.value}
         total = 0
         for coord in self.coords:
+            index = self.grid.index(coord.x, coord.y, coord.z)
             surface_area = 6
-            for neighbor in self.neighbors:
-                if self.get_material(coord + neighbor) in {Material.LAVA, Material.INTERIOR}:
+            for offset in offsets:
+                if cells[index + offset] in solid:
                     surface_area -= 1
             total += surface_area
 
         return total
 
 
+def parse(filename: str) -> LavaDropletScan:
+    values = read_ints(filename)
+    coords = [Coord(*values[i:i + 3]) for i in range(0, len(values), 3)]
+    return LavaDropletScan(coords)
+
+
 def run(filename: str) -> None:
     print(f"File: {filename}")
-    with open(filename, "r", encoding="utf-8") as f:
-        lines = [(int(value) for value in line.rstrip().split(",")) for line in f.readlines()]
-
-    coords = [Coord(*values) for values in lines]
-    grid = LavaDropletScan(coords)
-    print(grid.surface_area)
+    with phase("parse"):
+        grid = cached_parse(filename, parse, PARSER_VERSION)
+    with phase("part 2"):
+        print(grid.surface_area)
 
     print()
 
 
 if __name__ == '__main__':
-    start = time.time()
-    run("example.txt")
-    run("input.txt")
-    # too high 4178, 4149
-    print(f"Time to execute: {time.time() - start}")
+    with recording() as report, profiling("18", "--profile" in sys.argv):
+        run(day_input(__file__, "example.txt"))
+        run(day_input(__file__, "input.txt"))
+        # too high 4178, 4149
+    print(report)
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
-import re
-import time
+import sys
 from collections import defaultdict
 from dataclasses import dataclass, field
 from enum import Enum, auto
 from typing import NewType
 
+from days.common.inputs import day_input, ints, read_lines
+from days.common.instrument import phase, profiling, recording
+
 
 class Material(Enum):
     ORE = "ore"
@@ -58,7 +60,7 @@ class RobotFactory:
     id: int
     costs: dict[Material, RobotCost]
     robots: list[Robots] = field(init=False)
-    supply: MaterialSupply = field(default=MaterialSupply(), init=False)
+    supply: MaterialSupply = field(default_factory=MaterialSupply, init=False)
 
     def __post_init__(self) -> None:
         self.robots = [
@@ -87,18 +89,18 @@ class RobotFactory:
 def build_factories(lines: list[str]) -> list[RobotFactory]:
     factories = []
     for line in lines:
-        numbers = re.findall(r"\d+", line)
-        blueprint_id = int(numbers[0])
+        numbers = ints(line)
+        blueprint_id = numbers[0]
         ore_cost = defaultdict(lambda: 0)
-        ore_cost[Material.ORE] = int(numbers[1])
+        ore_cost[Material.ORE] = numbers[1]
         clay_cost = defaultdict(lambda: 0)
-        clay_cost[Material.ORE] = int(numbers[2])
+        clay_cost[Material.ORE] = numbers[2]
         obsidian_cost = defaultdict(lambda: 0)
-        obsidian_cost[Material.ORE] = int(numbers[3])
-        obsidian_cost[Material.CLAY] = int(numbers[4])
+        obsidian_cost[Material.ORE] = numbers[3]
+        obsidian_cost[Material.CLAY] = numbers[4]
         geode_cost = defaultdict(lambda: 0)
-        geode_cost[Material.ORE] = int(numbers[5])
-        geode_cost[Material.OBSIDIAN] = int(numbers[6])
+        geode_cost[Material.ORE] = numbers[5]
+        geode_cost[Material.OBSIDIAN] = numbers[6]
         costs = {
             Material.ORE: ore_cost,
             Material.CLAY: clay_cost,
@@ -110,20 +112,21 @@ def build_factories(lines: list[str]) -> list[RobotFactory]:
 
 
 def run(filename: str) -> None:
-    with open(filename, "r", encoding="utf-8") as f:
-        lines = [line.rstrip() for line in f.readlines()]
-    print(f"File: {filename}")
-    factories = build_factories(lines)
-    minutes = 24
-    for minute in range(minutes):
-        for factory in factories:
-            factory.build()
-    total_geodes = sum([factory.supply.materials[Material.GEODE] for factory in factories])
+    with phase("parse"):
+        lines = list(read_lines(filename))
+        print(f"File: {filename}")
+        factories = build_factories(lines)
+    with phase("part 1"):
+        minutes = 24
+        for minute in range(minutes):
+            for factory in factories:
+                factory.build()
+        total_geodes = sum([factory.supply.materials[Material.GEODE] for factory in factories])
     print(total_geodes)
 
 
 if __name__ == '__main__':
-    start = time.time()
-    run("example.txt")
-    # run("input.txt")
-    print(f"Time to execute: {time.time() - start}")
+    with recording() as report, profiling("19", "--profile" in sys.argv):
+        run(day_input(__file__, "example.txt"))
+        # run(day_input(__file__, "input.txt"))
+    print(report)
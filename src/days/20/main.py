@@ -1,9 +1,12 @@
 from __future__ import annotations
 
-import time
+import sys
 import uuid
 from dataclasses import dataclass, field
 
+from days.common.inputs import day_input, read_ints
+from days.common.instrument import phase, profiling, recording
+
 ANSWER = [
         [1, 2, -3, 3, -2, 0, 4],
         [2, 1, -3, 3, -2, 0, 4],
@@ -100,16 +103,18 @@ def decrypt(code: list[int], decryption_key: int = 1, rounds: int = 1) -> int:
 
 
 def run(filename: str) -> None:
-    with open(filename, "r", encoding="utf-8") as f:
-        code = [int(line.rstrip()) for line in f.readlines()]
+    with phase("parse"):
+        code = read_ints(filename)
     print(f"File: {filename}")
-    print(f"Part 1: {decrypt(code)}")
-    print(f"Part 2: {decrypt(code, 811589153, 10)}")
+    with phase("part 1"):
+        print(f"Part 1: {decrypt(code)}")
+    with phase("part 2"):
+        print(f"Part 2: {decrypt(code, 811589153, 10)}")
     print()
 
 
 if __name__ == '__main__':
-    start = time.time()
-    # run("example.txt")
-    run("input.txt")
-    print(f"Time to execute: {time.time() - start}")
+    with recording() as report, profiling("20", "--profile" in sys.argv):
+        # run(day_input(__file__, "example.txt"))
+        run(day_input(__file__, "input.txt"))
+    print(report)
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import operator
-import re
-import time
+import sys
 from dataclasses import dataclass
 from typing import Callable
 
+from days.common.inputs import day_input, ints, read_lines
+from days.common.instrument import phase, profiling, recording
+
 
 @dataclass
 class Monkey:
@@ -60,8 +62,8 @@ def parse_monkeys(lines: list[str]) -> dict[str, Monkey]:
     monkey_friends = {}
     for line in lines:
         name = line[:4]
-        if values := re.findall(r"\d+", line):
-            monkeys[name] = Monkey(name, value=int(values[0]))
+        if values := ints(line):
+            monkeys[name] = Monkey(name, value=values[0])
         else:
             left, op, right = line[5:].split()
             match op:
@@ -105,12 +107,14 @@ def find_human_number(lines: list[str]) -> int:
 
 
 def run(filename: str) -> None:
-    with open(filename, "r", encoding="utf-8") as f:
-        lines = [line.rstrip() for line in f.readlines()]
-    print(f"File: {filename}")
-    root = parse_monkeys(lines)["root"]
-    print(f"Part 1: {root.yell()}")
-    print(f"Part 2: {find_human_number(lines)}")
+    with phase("parse"):
+        lines = list(read_lines(filename))
+        print(f"File: {filename}")
+        root = parse_monkeys(lines)["root"]
+    with phase("part 1"):
+        print(f"Part 1: {root.yell()}")
+    with phase("part 2"):
+        print(f"Part 2: {find_human_number(lines)}")
     print()
 
     # solution here
@@ -119,7 +123,7 @@ def run(filename: str) -> None:
 
 
 if __name__ == '__main__':
-    start = time.time()
-    run("example.txt")
-    run("input.txt")
-    print(f"Time to execute: {time.time() - start}")
+    with recording() as report, profiling("21", "--profile" in sys.argv):
+        run(day_input(__file__, "example.txt"))
+        run(day_input(__file__, "input.txt"))
+    print(report)
@@ -1,16 +1,28 @@
 from __future__ import annotations
 
 import re
-import time
+import sys
 from dataclasses import dataclass, field
-from enum import Enum
+from enum import Enum, IntEnum
 from itertools import zip_longest
 
+from days.common.cache import cached_parse
+from days.common.grid import Grid2D
+from days.common.inputs import day_input, read_lines
+from days.common.instrument import phase, profiling, recording
 
-class Material(Enum):
-    VOID = "void"
-    WALL = "wall"
-    PATH = "path"
+
+PARSER_VERSION = 1
+
+
+class Material(IntEnum):
+    VOID = 0
+    WALL = 1
+    PATH = 2
+
+
+MATERIALS = {" ": Material.VOID, "#": Material.WALL, ".": Material.PATH}
+SYMBOLS = {material: symbol for symbol, material in MATERIALS.items()}
 
 
 class Turn(Enum):
@@ -71,67 +83,75 @@ class Coord:
 
 
 class Map:
-    _grid: list[list[Material]]
+    _grid: Grid2D
     height: int
     width: int
+    _offsets: dict[Orientation, int]
 
     def __init__(self, lines: list[str]) -> None:
-        self.height = len(lines)
-        self.width = max(len(row) for row in lines)
-        self._grid = [[Material.VOID for x in range(self.width)] for y in range(self.height)]
-        for y, row in enumerate(lines):
-            for x, value in enumerate(row):
-                match value:
-                    case ".":
-                        self._grid[y][x] = Material.PATH
-                    case "#":
-                        self._grid[y][x] = Material.WALL
+        self._grid = Grid2D.from_lines(lines, MATERIALS, fill=Material.VOID, border=Material.VOID)
+        self.height = self._grid.height
+        self.width = self._grid.width
+        up, right, down, left = self._grid.offsets4
+        self._offsets = {
+            Orientation.UP: up,
+            Orientation.RIGHT: right,
+            Orientation.DOWN: down,
+            Orientation.LEFT: left,
+        }
 
     def top_left(self) -> Coord:
-        for x, material in enumerate(self._grid[0]):
+        for x, material in enumerate(self._grid.row(0)):
             if material == Material.PATH:
                 return Coord(x, 0)
 
     def get(self, coord: Coord) -> Material | None:
         if not self.in_bounds(coord):
             return None
-        return self._grid[coord.y][coord.x]
+        return Material(self._grid.get(coord.x, coord.y))
 
     def in_bounds(self, coord: Coord) -> bool:
-        return 0 <= coord.x < self.width and 0 <= coord.y < self.height
-
-    def get_next(self, position: Coord, direction: Orientation) -> Coord | None:
-        if not self.in_bounds(position):
-            return None
-        next_position = position.move(direction)
-        while not self.in_bounds(next_position) or self.get(next_position) == Material.VOID:
-            if not self.in_bounds(next_position):
-                match (next_position.x, next_position.y):
-                    case (x, -1):
-                        next_position = Coord(x, self.height - 1)
-                    case (x, self.height):
-                        next_position = Coord(x, 0)
-                    case (-1, y):
-                        next_position = Coord(self.width - 1, y)
-                    case (self.width, y):
-                        next_position = Coord(0, y)
-            else:
-                next_position = next_position.move(direction)
-        if self.get(next_position) == Material.WALL:
+        return self._grid.in_bounds(coord.x, coord.y)
+
+    def index(self, coord: Coord) -> int:
+        return self._grid.index(coord.x, coord.y)
+
+    def coord(self, index: int) -> Coord:
+        return Coord(*self._grid.coords(index))
+
+    def get_next(self, index: int, direction: Orientation) -> int | None:
+        """
+        Steps once from the cell at index, wrapping around past the edge of the map.
+        :param index: Grid index of the current position
+        :param direction:
+        :return: Grid index of the next position or None if a wall is in the way
+        """
+        grid = self._grid
+        cells = grid.cells
+        offset = self._offsets[direction]
+        next_index = index + offset
+        while cells[next_index] == Material.VOID:
+            x, y = grid.coords(next_index)
+            if grid.in_bounds(x, y):
+                next_index += offset
+                continue
+            match direction:
+                case Orientation.UP:
+                    next_index = grid.index(x, self.height - 1)
+                case Orientation.DOWN:
+                    next_index = grid.index(x, 0)
+                case Orientation.LEFT:
+                    next_index = grid.index(self.width - 1, y)
+                case Orientation.RIGHT:
+                    next_index = grid.index(0, y)
+        if cells[next_index] == Material.WALL:
             return None
-        return next_position
+        return next_index
 
     def stringify(self) -> str:
         out = ""
-        for row in self._grid:
-            for material in row:
-                match material:
-                    case Material.VOID:
-                        out += " "
-                    case Material.PATH:
-                        out += "."
-                    case Material.WALL:
-                        out += "#"
+        for y in range(self.height):
+            out += "".join(SYMBOLS[material] for material in self._grid.row(y))
             out += "\n"
         return out
 
@@ -209,13 +229,13 @@ class Player:
         self.orientation = self.orientation.turn(turn)
 
     def move(self, distance: int, grove_map: Map) -> None:
-        position = self.position
+        position = grove_map.index(self.position)
         for _ in range(distance):
             next_position = grove_map.get_next(position, self.orientation)
-            if not next_position:
+            if next_position is None:
                 break
             position = next_position
-        self.position = position
+        self.position = grove_map.coord(position)
         self.history.append((self.position, self.orientation))
 
     def score(self) -> int:
@@ -242,20 +262,24 @@ def traverse(player: Player, grove_map: Map, moves: list[int | Turn]) -> None:
             player.turn(move)
 
 
+def parse(filename: str) -> tuple[Map, list[int | Turn]]:
+    lines = list(read_lines(filename))
+    return Map(lines[:-2]), parse_moves(lines[-1])
+
+
 def run(filename: str) -> None:
-    with open(filename, "r", encoding="utf-8") as f:
-        lines = [line.rstrip() for line in f.readlines()]
-    print(f"File: {filename}")
-    grove_map = Map(lines[:-2])
-    moves = parse_moves(lines[-1])
-    player = Player(position=grove_map.top_left(), orientation=Orientation.RIGHT)
-    traverse(player, grove_map, moves)
+    with phase("parse"):
+        print(f"File: {filename}")
+        grove_map, moves = cached_parse(filename, parse, PARSER_VERSION)
+    with phase("part 1"):
+        player = Player(position=grove_map.top_left(), orientation=Orientation.RIGHT)
+        traverse(player, grove_map, moves)
     print(player.score())
     print()
 
 
 if __name__ == '__main__':
-    start = time.time()
-    run("example.txt")
-    run("input.txt")
-    print(f"Time to execute: {time.time() - start}")
+    with recording() as report, profiling("22", "--profile" in sys.argv):
+        run(day_input(__file__, "example.txt"))
+        run(day_input(__file__, "input.txt"))
+    print(report)
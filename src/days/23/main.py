@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 import sys
-import time
-from collections import Counter, defaultdict, deque
-from dataclasses import dataclass
+from collections import deque
 from enum import Enum
 
+from days.common.coord import Coord
+from days.common.grid import Grid2D
+from days.common.inputs import day_input, read_lines
+from days.common.instrument import phase, profiling, recording
+
 
 class Direction(Enum):
     UP = "up"
@@ -14,85 +17,83 @@ class Direction(Enum):
     RIGHT = "right"
 
 
-@dataclass(frozen=True)
-class Coord:
-    x: int
-    y: int
-
-    def __add__(self, other: Coord) -> Coord:
-        return Coord(self.x + other.x, self.y + other.y)
-
-    def move(self, direction: Direction) -> Coord:
-        match direction:
-            case Direction.UP:
-                return Coord(self.x, self.y - 1)
-            case Direction.DOWN:
-                return Coord(self.x, self.y + 1)
-            case Direction.LEFT:
-                return Coord(self.x - 1, self.y)
-            case Direction.RIGHT:
-                return Coord(self.x + 1, self.y)
-
-    def neighbors(self, direction: Direction) -> set[Coord]:
-        match direction:
-            case Direction.UP:
-                return {Coord(self.x - 1, self.y - 1), Coord(self.x, self.y - 1), Coord(self.x + 1, self.y - 1)}
-            case Direction.DOWN:
-                return {Coord(self.x - 1, self.y + 1), Coord(self.x, self.y + 1), Coord(self.x + 1, self.y + 1)}
-            case Direction.LEFT:
-                return {Coord(self.x - 1, self.y - 1), Coord(self.x - 1, self.y), Coord(self.x - 1, self.y + 1)}
-            case Direction.RIGHT:
-                return {Coord(self.x + 1, self.y - 1), Coord(self.x + 1, self.y), Coord(self.x + 1, self.y + 1)}
-
-    def touching(self, others: set[Coord]) -> bool:
-        neighbors = {
-            Coord(self.x + 1, self.y + 1),
-            Coord(self.x + 1, self.y - 1),
-            Coord(self.x - 1, self.y + 1),
-            Coord(self.x - 1, self.y - 1),
-            Coord(self.x + 1, self.y),
-            Coord(self.x - 1, self.y),
-            Coord(self.x, self.y + 1),
-            Coord(self.x, self.y - 1),
+EMPTY = 0
+ELF = 1
+# Padding around the grove; an elf stepping onto it triggers a re-grow
+EDGE = 2
+# Empty tiles added on every side when the grove is re-grown
+MARGIN = 16
+
+
+class Grove:
+    """
+    Elf positions on a flat occupancy grid. Elves are stored as grid indices and looked up
+    through precomputed offsets, so no coordinates are built while moving.
+    """
+    grid: Grid2D
+    elves: list[int]
+    # Three cells that must be empty and the step taken per direction
+    checks: dict[Direction, tuple[tuple[int, int, int], int]]
+
+    def __init__(self, positions: list[Coord]) -> None:
+        self._build(positions)
+
+    def _build(self, positions: list[Coord]) -> None:
+        min_x = min(position.x for position in positions) - MARGIN
+        min_y = min(position.y for position in positions) - MARGIN
+        width = max(position.x for position in positions) - min_x + MARGIN + 1
+        height = max(position.y for position in positions) - min_y + MARGIN + 1
+        self.grid = Grid2D(width, height, EMPTY, border=EDGE)
+        self.elves = []
+        for position in positions:
+            index = self.grid.index(position.x - min_x, position.y - min_y)
+            self.grid[index] = ELF
+            self.elves.append(index)
+
+        up, up_right, right, down_right, down, down_left, left, up_left = self.grid.offsets8
+        self.checks = {
+            Direction.UP: ((up_left, up, up_right), up),
+            Direction.DOWN: ((down_left, down, down_right), down),
+            Direction.LEFT: ((up_left, left, down_left), left),
+            Direction.RIGHT: ((up_right, right, down_right), right),
         }
-        return bool(neighbors & others)
 
+    def positions(self) -> list[Coord]:
+        return [Coord(*self.grid.coords(elf)) for elf in self.elves]
 
-@dataclass
-class Elf:
-    location: Coord
-    proposed: Coord | None = None
+    def regrow(self) -> None:
+        self._build(self.positions())
 
 
-def bounds(elves: list[Elf]) -> tuple[Coord, Coord]:
+def bounds(grove: Grove) -> tuple[Coord, Coord]:
     min_x, min_y = sys.maxsize, sys.maxsize
     max_x, max_y = -sys.maxsize, -sys.maxsize
-    for elf in elves:
-        min_x = min(elf.location.x, min_x)
-        min_y = min(elf.location.y, min_y)
-        max_x = max(elf.location.x, max_x)
-        max_y = max(elf.location.y, max_y)
+    for position in grove.positions():
+        min_x = min(position.x, min_x)
+        min_y = min(position.y, min_y)
+        max_x = max(position.x, max_x)
+        max_y = max(position.y, max_y)
 
     return Coord(min_x, min_y), Coord(max_x, max_y)
 
 
-def grove_dimensions(elves: list[Elf]) -> tuple[int, int]:
-    min_pos, max_pos = bounds(elves)
+def grove_dimensions(grove: Grove) -> tuple[int, int]:
+    min_pos, max_pos = bounds(grove)
     width = abs(max_pos.x - min_pos.x + 1)
     height = abs(max_pos.y - min_pos.y + 1)
     return width, height
 
 
-def count_empty_tiles(elves: list[Elf]) -> int:
-    width, height = grove_dimensions(elves)
-    return width * height - len(elves)
+def count_empty_tiles(grove: Grove) -> int:
+    width, height = grove_dimensions(grove)
+    return width * height - len(grove.elves)
 
 
-def print_grove(elves: list[Elf]) -> str:
-    min_pos, _ = bounds(elves)
-    width, height = grove_dimensions(elves)
+def print_grove(grove: Grove) -> str:
+    min_pos, _ = bounds(grove)
+    width, height = grove_dimensions(grove)
     out = ""
-    positions = {elf.location for elf in elves}
+    positions = set(grove.positions())
     for y in range(min_pos.y - 1, min_pos.y + height + 1):
         for x in range(min_pos.x - 1, min_pos.x + width + 1):
             position = Coord(x, y)
@@ -105,60 +106,72 @@ def print_grove(elves: list[Elf]) -> str:
     return out
 
 
-def find_elves(lines: list[str]) -> list[Elf]:
-    elves = []
+def find_elves(lines: list[str]) -> Grove:
+    positions = []
     for y, row in enumerate(lines):
         for x, position in enumerate(row):
             if position == "#":
-                elves.append(Elf(Coord(x, y)))
+                positions.append(Coord(x, y))
 
-    return elves
+    return Grove(positions)
 
 
-def move_elves(elves: list[Elf], moves: deque[Direction]) -> tuple[deque[Direction], bool]:
-    proposed_moves = defaultdict(lambda: 0)
-    current_elf_positions = {elf.location for elf in elves}
-    elves_moved = False
-    for elf in elves:
-        for move in moves:
-            if elf.proposed:
-                continue
+def move_elves(grove: Grove, moves: deque[Direction]) -> tuple[deque[Direction], bool]:
+    cells = grove.grid.cells
+    elves = grove.elves
+    neighbors = grove.grid.offsets8
+    checks = [grove.checks[move] for move in moves]
+    # Proposed index -> the proposing elf, or -1 once a second elf proposes it
+    proposed_moves = {}
+    for elf_id, elf in enumerate(elves):
+        if not any(cells[elf + offset] == ELF for offset in neighbors):
+            continue
 
-            if not elf.location.touching(current_elf_positions):
+        for (first, second, third), step in checks:
+            if cells[elf + first] == ELF or cells[elf + second] == ELF or cells[elf + third] == ELF:
                 continue
+            proposed = elf + step
+            proposed_moves[proposed] = -1 if proposed in proposed_moves else elf_id
+            break
 
-            if elf.location.neighbors(move) & current_elf_positions:
-                continue
-
-            elf.proposed = elf.location.move(move)
-            proposed_moves[elf.proposed] += 1
-
-    for elf in elves:
-        if proposed_moves[elf.proposed] == 1:
-            elves_moved = True
-            elf.location = elf.proposed
-        elf.proposed = None
+    elves_moved = False
+    needs_room = False
+    for proposed, elf_id in proposed_moves.items():
+        if elf_id < 0:
+            continue
+        elves_moved = True
+        needs_room = needs_room or cells[proposed] == EDGE
+        cells[elves[elf_id]] = EMPTY
+        cells[proposed] = ELF
+        elves[elf_id] = proposed
+    if needs_room:
+        grove.regrow()
     next_moves = moves.copy()
     next_moves.rotate(-1)
     return next_moves, elves_moved
 
 
-def run(filename: str) -> None:
-    with open(filename, "r", encoding="utf-8") as f:
-        lines = [line.rstrip() for line in f.readlines()]
-    print(f"File: {filename}")
+def run(filename: str, rounds: int = 10) -> None:
+    with phase("parse"):
+        lines = list(read_lines(filename))
+        print(f"File: {filename}")
 
-    elves = find_elves(lines)
-    # print(print_grove(elves))
+        grove = find_elves(lines)
+    # print(print_grove(grove))
     moves = deque([Direction.UP, Direction.DOWN, Direction.LEFT, Direction.RIGHT])
     keep_moving = True
     count = 0
-    while keep_moving:
-        moves, keep_moving = move_elves(elves, moves)
-        count += 1
-        if count == 10:
-            print(count_empty_tiles(elves))
-        # print(print_grove(elves))
+    with phase("part 1"):
+        while keep_moving and count < rounds:
+            moves, keep_moving = move_elves(grove, moves)
+            count += 1
+        if count == rounds:
+            print(count_empty_tiles(grove))
+    with phase("part 2"):
+        while keep_moving:
+            moves, keep_moving = move_elves(grove, moves)
+            count += 1
+            # print(print_grove(grove))
 
     print(count)
 
@@ -166,8 +179,8 @@ def run(filename: str) -> None:
 
 
 if __name__ == '__main__':
-    start = time.time()
-    # run("small_example.txt")
-    run("example.txt")
-    # run("input.txt")
-    print(f"Time to execute: {time.time() - start}")
+    with recording() as report, profiling("23", "--profile" in sys.argv):
+        # run(day_input(__file__, "small_example.txt"))
+        run(day_input(__file__, "example.txt"))
+        # run(day_input(__file__, "input.txt"))
+    print(report)
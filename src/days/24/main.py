@@ -1,12 +1,19 @@
 from __future__ import annotations
 
-import time
+import sys
 from collections import deque
 from collections.abc import MutableMapping
-from dataclasses import dataclass
-from enum import Enum
+from enum import Enum, IntFlag
 from typing import Iterator
 
+from days.common.cache import cached_parse
+from days.common.grid import Grid2D
+from days.common.inputs import day_input, read_lines
+from days.common.instrument import phase, profiling, recording
+
+
+PARSER_VERSION = 1
+
 
 class Direction(Enum):
     UP = "^"
@@ -29,54 +36,46 @@ class Direction(Enum):
                 raise ValueError(f"Not a valid direction: {char}")
 
 
-@dataclass(frozen=True)
-class Coord:
-    x: int
-    y: int
-
-    def __add__(self, other: Coord) -> Coord:
-        return Coord(self.x + other.x, self.y + other.y)
-
-    def move(self, direction: Direction) -> Coord:
-        match direction:
-            case Direction.UP:
-                return Coord(self.x, self.y - 1)
-            case Direction.DOWN:
-                return Coord(self.x, self.y + 1)
-            case Direction.LEFT:
-                return Coord(self.x - 1, self.y)
-            case Direction.RIGHT:
-                return Coord(self.x + 1, self.y)
+class Cell(IntFlag):
+    EMPTY = 0
+    UP = 1
+    RIGHT = 2
+    DOWN = 4
+    LEFT = 8
+    WALL = 16
 
 
-@dataclass(frozen=True)
-class Blizzard:
-    location: Coord
-    direction: Direction
+CELLS = {".": Cell.EMPTY, "#": Cell.WALL, "^": Cell.UP, ">": Cell.RIGHT, "v": Cell.DOWN, "<": Cell.LEFT}
+BLIZZARDS = {
+    Cell.UP: Direction.UP,
+    Cell.RIGHT: Direction.RIGHT,
+    Cell.DOWN: Direction.DOWN,
+    Cell.LEFT: Direction.LEFT,
+}
 
-    def move(self) -> Blizzard:
-        return Blizzard(self.location.move(self.direction), self.direction)
 
-
-class BlizzardActivity(MutableMapping[int, set[Blizzard]]):
-    store: dict[int, set[Blizzard]]
+class BlizzardActivity(MutableMapping[int, Grid2D]):
+    """
+    The valley at each minute: walls plus a bitmask of the blizzards in every cell.
+    """
+    store: dict[int, Grid2D]
     width: int
     height: int
-    border: set[Coord]
+    walls: Grid2D
 
-    def __init__(self, width: int, height: int, border: set[Coord]) -> None:
+    def __init__(self, width: int, height: int, walls: Grid2D) -> None:
         super().__init__()
         self.store = {}
         self.width = width
         self.height = height
-        self.border = border
+        self.walls = walls
 
-    def __getitem__(self, minute: int) -> set[Blizzard]:
+    def __getitem__(self, minute: int) -> Grid2D:
         if minute not in self.store:
             self.store[minute] = self._move_blizzards(minute - 1)
         return self.store[minute]
 
-    def __setitem__(self, key: int, value: set[Blizzard]) -> None:
+    def __setitem__(self, key: int, value: Grid2D) -> None:
         self.store[key] = value
 
     def __delitem__(self, key: int) -> None:
@@ -88,82 +87,80 @@ class BlizzardActivity(MutableMapping[int, set[Blizzard]]):
     def __iter__(self) -> Iterator[int]:
         return iter(self)
 
-    def _move_blizzards(self, minute: int) -> set[Blizzard]:
-        blizzards = self.get(minute)
-        moved_blizzards = set()
-        for blizzard in blizzards:
-            next_blizzard = blizzard.move()
-            if next_blizzard.location in self.border:
-                match next_blizzard.direction:
-                    case Direction.UP:
-                        wrapped_location = Coord(next_blizzard.location.x, self.height - 2)
-                    case Direction.RIGHT:
-                        wrapped_location = Coord(1, next_blizzard.location.y)
-                    case Direction.DOWN:
-                        wrapped_location = Coord(next_blizzard.location.x, 1)
-                    case Direction.LEFT:
-                        wrapped_location = Coord(self.width - 2, next_blizzard.location.y)
-                    case _:
-                        raise ValueError("Unrecognized direction")
-                next_blizzard = Blizzard(wrapped_location, next_blizzard.direction)
-            moved_blizzards.add(next_blizzard)
-        return moved_blizzards
-
-    def blizzards(self, location: Coord, minute: int) -> set[Blizzard]:
-        return {blizzard for blizzard in self.get(minute) if blizzard.location == location}
+    def _move_blizzards(self, minute: int) -> Grid2D:
+        valley = self.get(minute)
+        moved = self.walls.copy()
+        walls = self.walls.cells
+        cells = moved.cells
+        offsets = dict(zip(BLIZZARDS, valley.offsets4))
+        for index in valley.indices():
+            blizzards = valley[index] & ~Cell.WALL
+            if not blizzards:
+                continue
+            for direction in BLIZZARDS:
+                if not blizzards & direction:
+                    continue
+                next_index = index + offsets[direction]
+                if walls[next_index] == Cell.WALL:
+                    x, y = valley.coords(next_index)
+                    match direction:
+                        case Cell.UP:
+                            next_index = valley.index(x, self.height - 2)
+                        case Cell.RIGHT:
+                            next_index = valley.index(1, y)
+                        case Cell.DOWN:
+                            next_index = valley.index(x, 1)
+                        case Cell.LEFT:
+                            next_index = valley.index(self.width - 2, y)
+                cells[next_index] |= direction
+        return moved
+
+    def blizzards(self, index: int, minute: int) -> list[Direction]:
+        blizzards = self.get(minute)[index]
+        return [direction for cell, direction in BLIZZARDS.items() if blizzards & cell]
 
 
 class Mountain:
-    entrance: Coord
-    exit: Coord
+    entrance: int
+    exit: int
     width: int
     height: int
-    border: set[Coord]
+    walls: Grid2D
     blizzards: BlizzardActivity
 
     def __init__(self, lines: list[str]) -> None:
-        self.border = set()
-        self.height = len(lines)
-        self.width = len(lines[0])
-        blizzards = set()
-        for y, row in enumerate(lines):
-            for x, char in enumerate(row):
-                match char:
-                    case "#":
-                        self.border.add(Coord(x, y))
-                    case ".":
-                        if y == 0:
-                            self.entrance = Coord(x, y)
-                        if y == len(lines) - 1:
-                            self.exit = Coord(x, y)
-                    case "^" | "v" | "<" | ">":
-                        blizzards.add(Blizzard(Coord(x, y), Direction.from_char(char)))
-
-        # Block the path above the entrance
-        self.border.add(Coord(self.entrance.x, self.entrance.y - 1))
-        self.blizzard_activity = BlizzardActivity(self.width, self.height, self.border)
-        self.blizzard_activity[0] = blizzards
-
-    def can_move(self, location: Coord, minute: int) -> bool:
-        if location in self.border or location == self.entrance:
-            return False
-        if location in {blizzard.location for blizzard in self.blizzard_activity[minute]}:
+        # Everything outside the valley, including above the entrance, is wall
+        valley = Grid2D.from_lines(lines, CELLS, border=Cell.WALL)
+        self.height = valley.height
+        self.width = valley.width
+        self.walls = Grid2D(self.width, self.height, border=Cell.WALL)
+        for index in valley.indices():
+            if valley[index] == Cell.WALL:
+                self.walls[index] = Cell.WALL
+        self.entrance = valley.index(lines[0].index("."), 0)
+        self.exit = valley.index(lines[-1].index("."), self.height - 1)
+
+        self.blizzard_activity = BlizzardActivity(self.width, self.height, self.walls)
+        self.blizzard_activity[0] = valley
+
+    def can_move(self, location: int, minute: int) -> bool:
+        if location == self.entrance:
             return False
-        return True
+        return not self.blizzard_activity[minute][location]
 
 
-def stringify_scene(mountain: Mountain, location: Coord, minute: int) -> str:
+def stringify_scene(mountain: Mountain, location: int, minute: int) -> str:
     out = ""
     for y in range(mountain.height):
         for x in range(mountain.width):
-            pos = Coord(x, y)
+            pos = mountain.walls.index(x, y)
             if pos == location:
                 out += "E"
-            elif pos in mountain.border:
+            elif mountain.walls[pos] == Cell.WALL:
                 out += "#"
             elif blizzards := mountain.blizzard_activity.blizzards(pos, minute):
                 if len(blizzards) == 1:
-                    out += blizzards.pop().direction.value
+                    out += blizzards.pop().value
                 else:
                     out += str(len(blizzards))
             else:
@@ -173,9 +170,9 @@ def stringify_scene(mountain: Mountain, location: Coord, minute: int) -> str:
     return out
 
 
-def traverse(lines: list[str]) -> int:
-    mountain = Mountain(lines)
-    directions = [Direction.DOWN, Direction.RIGHT, None, Direction.UP, Direction.LEFT]
+def traverse(mountain: Mountain) -> int:
+    up, right, down, left = mountain.walls.offsets4
+    directions = [down, right, 0, up, left]
     queue = deque()
     queue.append((mountain.entrance, 0))
     lowest_minutes = -1
@@ -187,24 +184,29 @@ def traverse(lines: list[str]) -> int:
             print(lowest_minutes)
             continue
         for direction in directions:
-            next_location = location.move(direction) if direction else location
+            next_location = location + direction
             if mountain.can_move(next_location, minutes + 1):
                 queue.append((next_location, minutes + 1))
     return lowest_minutes
 
 
+def parse(filename: str) -> Mountain:
+    return Mountain(list(read_lines(filename)))
+
+
 def run(filename: str) -> None:
-    with open(filename, "r", encoding="utf-8") as f:
-        lines = [line.rstrip() for line in f.readlines()]
-    print(f"File: {filename}")
-    minutes = traverse(lines)
+    with phase("parse"):
+        print(f"File: {filename}")
+        mountain = cached_parse(filename, parse, PARSER_VERSION)
+    with phase("part 1"):
+        minutes = traverse(mountain)
     print(minutes)
     print()
 
 
 if __name__ == '__main__':
-    start = time.time()
-    # run("simple_example.txt")
-    run("example.txt")
-    # run("input.txt")
-    print(f"Time to execute: {time.time() - start}")
+    with recording() as report, profiling("24", "--profile" in sys.argv):
+        # run(day_input(__file__, "simple_example.txt"))
+        run(day_input(__file__, "example.txt"))
+        # run(day_input(__file__, "input.txt"))
+    print(report)
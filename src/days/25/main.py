@@ -1,11 +1,14 @@
 from __future__ import annotations
 
-import time
+import sys
 from dataclasses import dataclass, field
 from functools import reduce
 from itertools import zip_longest
 from operator import add
 
+from days.common.inputs import day_input, read_lines
+from days.common.instrument import phase, profiling, recording
+
 SNAFU_VALUES = {
     "2": 2,
     "1": 1,
@@ -72,17 +75,18 @@ class Snafu:
 
 
 def run(filename: str) -> None:
-    with open(filename, "r", encoding="utf-8") as f:
-        lines = [line.rstrip() for line in f.readlines()]
-    print(f"File: {filename}")
-    snafus = [Snafu(line) for line in lines]
-    total = reduce(add, snafus)
+    with phase("parse"):
+        lines = list(read_lines(filename))
+        print(f"File: {filename}")
+        snafus = [Snafu(line) for line in lines]
+    with phase("part 1"):
+        total = reduce(add, snafus)
     print(total, total.base_10)
     print()
 
 
 if __name__ == '__main__':
-    start = time.time()
-    run("example.txt")
-    run("input.txt")
-    print(f"Time to execute: {time.time() - start}")
+    with recording() as report, profiling("25", "--profile" in sys.argv):
+        run(day_input(__file__, "example.txt"))
+        run(day_input(__file__, "input.txt"))
+    print(report)
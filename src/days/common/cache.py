@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, TypeVar
+
+PARSE_CACHE_DIR = ".parse-cache"
+RESULT_CACHE_DIR = ".result-cache"
+# Shared modules whose classes end up inside cached parses; their source is part of every key
+STRUCTURE_SOURCES = [Path(__file__).with_name("grid.py")]
+
+T = TypeVar("T")
+
+_cache_dir: Path | None = None
+
+
+@contextmanager
+def caching(directory: str | Path | None = PARSE_CACHE_DIR) -> Iterator[None]:
+    """
+    Enables the parsed-input cache inside the block. Outside of it cached_parse() always parses.
+    :param directory: Where to keep the pickled structures; None leaves the cache disabled
+    :return:
+    """
+    global _cache_dir
+    previous = _cache_dir
+    _cache_dir = Path(directory) if directory is not None else None
+    try:
+        yield
+    finally:
+        _cache_dir = previous
+
+
+def file_digest(*filenames: str | Path) -> str:
+    digest = hashlib.sha256()
+    for filename in filenames:
+        with open(filename, "rb") as f:
+            while chunk := f.read(1 << 20):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cached_parse(filename: str, parser: Callable[[str], T], version: int = 1) -> T:
+    """
+    Returns parser(filename), loading it from the cache when the same input was parsed before.
+    Entries are keyed by the parser, its version, the SHA-256 of the input and the source of the
+    shared structure modules such as Grid2D, so bump the version whenever the parser or the
+    day's own structures change.
+    :param filename:
+    :param parser: Builds the structure from the input file; the result must be picklable
+    :param version:
+    :return:
+    """
+    if _cache_dir is None:
+        return parser(filename)
+
+    name = f"{parser.__module__}.{parser.__qualname__}".replace("<", "").replace(">", "")
+    structures = file_digest(*STRUCTURE_SOURCES)[:16]
+    path = _cache_dir / f"{name}-v{version}-{structures}-{file_digest(filename)}.pickle"
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        pass
+    except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        # Written by an incompatible version of the code; parse again and overwrite it
+        pass
+
+    parsed = parser(filename)
+    _cache_dir.mkdir(parents=True, exist_ok=True)
+    # Workers may parse the same input concurrently; each writes its own file and renames it
+    partial = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(partial, "wb") as f:
+        pickle.dump(parsed, f, protocol=pickle.HIGHEST_PROTOCOL)
+    partial.replace(path)
+    return parsed
+
+
+def result_key(filename: str, sources: list[Path], params: dict[str, Any]) -> str:
+    """
+    Identifies an answer by everything it depends on: the input, the solver source and its parameters.
+    :param filename: Input file
+    :param sources: Source files of the solver and everything it imports from this repo
+    :param params: Keyword arguments passed to the solver
+    :return:
+    """
+    key = {
+        "input": file_digest(filename),
+        "source": file_digest(*sources),
+        "params": params,
+    }
+    return hashlib.sha256(json.dumps(key, sort_keys=True, default=repr).encode()).hexdigest()
+
+
+def load_result(directory: str | Path, key: str) -> dict[str, Any] | None:
+    try:
+        with open(Path(directory) / f"{key}.json", "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def store_result(directory: str | Path, key: str, result: dict[str, Any]) -> None:
+    path = Path(directory) / f"{key}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(partial, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    partial.replace(path)
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from typing import NamedTuple
+
+
+class Coord(NamedTuple):
+    """
+    An immutable 2D position. Being a plain tuple underneath it hashes and compares in C and
+    carries no per-instance __dict__, which keeps large sets of positions cheap.
+    Axis orientation is up to the caller; offsets are plain Coords added to a position.
+    """
+    x: int
+    y: int
+
+    def __add__(self, other: tuple[int, int]) -> Coord:
+        return _new(Coord, (self[0] + other[0], self[1] + other[1]))
+
+    def __str__(self) -> str:
+        return f"{self.x}, {self.y}"
+
+    def is_touching(self, other: tuple[int, int]) -> bool:
+        return abs(self[0] - other[0]) <= 1 and abs(self[1] - other[1]) <= 1
+
+
+# Skips the keyword-argument handling of the generated Coord.__new__ in hot paths
+_new = tuple.__new__
+
+ORIGIN = Coord(0, 0)
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+from typing import Iterator, Mapping
+
+
+def translation_table(values: Mapping[str, int], default: int = 0) -> bytes:
+    """
+    Builds a bytes.translate() table mapping each character to its cell value.
+    :param values: Cell value per character
+    :param default: Value for every character not in values
+    :return:
+    """
+    table = bytearray([default]) * 256
+    for char, value in values.items():
+        table[ord(char)] = value
+    return bytes(table)
+
+
+class Grid2D:
+    """
+    A width x height grid of byte-sized cells stored row-major in one flat bytearray.
+    The grid is surrounded by `padding` cells holding `border`, so a neighbor of any interior
+    cell can be read without a bounds check. Cells are addressed by integer index; moving
+    by one of the precomputed offsets moves to a neighboring cell.
+    """
+    width: int
+    height: int
+    padding: int
+    stride: int
+    cells: bytearray
+    # up, right, down, left
+    offsets4: tuple[int, int, int, int]
+    # up, up right, right, down right, down, down left, left, up left
+    offsets8: tuple[int, int, int, int, int, int, int, int]
+
+    def __init__(self, width: int, height: int, fill: int = 0, padding: int = 1, border: int = 0) -> None:
+        self.width = width
+        self.height = height
+        self.padding = padding
+        self.stride = width + 2 * padding
+        self.cells = bytearray([border]) * (self.stride * (height + 2 * padding))
+        if fill != border:
+            row = bytes([fill]) * width
+            for y in range(height):
+                start = self.index(0, y)
+                self.cells[start:start + width] = row
+        stride = self.stride
+        self.offsets4 = (-stride, 1, stride, -1)
+        self.offsets8 = (-stride, 1 - stride, 1, stride + 1, stride, stride - 1, -1, -stride - 1)
+
+    @classmethod
+    def from_lines(
+        cls, lines: list[str], values: Mapping[str, int], fill: int = 0, padding: int = 1, border: int = 0
+    ) -> Grid2D:
+        """
+        Parses a character map. Short lines are padded with `fill`.
+        :param lines:
+        :param values: Cell value per character; unlisted characters become `fill`
+        :param fill:
+        :param padding:
+        :param border:
+        :return:
+        """
+        grid = cls(max(len(line) for line in lines), len(lines), fill, padding, border)
+        table = translation_table(values, fill)
+        for y, line in enumerate(lines):
+            start = grid.index(0, y)
+            grid.cells[start:start + len(line)] = line.encode("latin-1").translate(table)
+        return grid
+
+    def __getitem__(self, index: int) -> int:
+        return self.cells[index]
+
+    def __setitem__(self, index: int, value: int) -> None:
+        self.cells[index] = value
+
+    def __len__(self) -> int:
+        return self.width * self.height
+
+    def index(self, x: int, y: int) -> int:
+        return (y + self.padding) * self.stride + x + self.padding
+
+    def coords(self, index: int) -> tuple[int, int]:
+        y, x = divmod(index, self.stride)
+        return x - self.padding, y - self.padding
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def get(self, x: int, y: int) -> int:
+        return self.cells[self.index(x, y)]
+
+    def set(self, x: int, y: int, value: int) -> None:
+        self.cells[self.index(x, y)] = value
+
+    def row(self, y: int) -> memoryview:
+        """
+        A zero-copy view of the interior of row y.
+        :param y:
+        :return:
+        """
+        start = self.index(0, y)
+        return memoryview(self.cells)[start:start + self.width]
+
+    def indices(self) -> Iterator[int]:
+        for y in range(self.height):
+            start = self.index(0, y)
+            yield from range(start, start + self.width)
+
+    def copy(self) -> Grid2D:
+        grid = Grid2D.__new__(Grid2D)
+        grid.__dict__.update(self.__dict__)
+        grid.cells = self.cells[:]
+        return grid
+
+
+class Grid3D:
+    """
+    A width x height x depth grid of byte-sized cells in one flat bytearray, padded on every
+    side like Grid2D.
+    """
+    width: int
+    height: int
+    depth: int
+    padding: int
+    stride: int
+    plane: int
+    cells: bytearray
+    # +z, -z, +y, -y, +x, -x
+    offsets6: tuple[int, int, int, int, int, int]
+
+    def __init__(
+        self, width: int, height: int, depth: int, fill: int = 0, padding: int = 1, border: int = 0
+    ) -> None:
+        self.width = width
+        self.height = height
+        self.depth = depth
+        self.padding = padding
+        self.stride = width + 2 * padding
+        self.plane = self.stride * (height + 2 * padding)
+        self.cells = bytearray([border]) * (self.plane * (depth + 2 * padding))
+        if fill != border:
+            row = bytes([fill]) * width
+            for z in range(depth):
+                for y in range(height):
+                    start = self.index(0, y, z)
+                    self.cells[start:start + width] = row
+        self.offsets6 = (self.plane, -self.plane, self.stride, -self.stride, 1, -1)
+
+    def __getitem__(self, index: int) -> int:
+        return self.cells[index]
+
+    def __setitem__(self, index: int, value: int) -> None:
+        self.cells[index] = value
+
+    def index(self, x: int, y: int, z: int) -> int:
+        padding = self.padding
+        return (z + padding) * self.plane + (y + padding) * self.stride + x + padding
+
+    def coords(self, index: int) -> tuple[int, int, int]:
+        z, rest = divmod(index, self.plane)
+        y, x = divmod(rest, self.stride)
+        return x - self.padding, y - self.padding, z - self.padding
+
+    def in_bounds(self, x: int, y: int, z: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height and 0 <= z < self.depth
+
+    def get(self, x: int, y: int, z: int) -> int:
+        return self.cells[self.index(x, y, z)]
+
+    def set(self, x: int, y: int, z: int, value: int) -> None:
+        self.cells[self.index(x, y, z)] = value
+
+    def row(self, y: int, z: int) -> memoryview:
+        start = self.index(0, y, z)
+        return memoryview(self.cells)[start:start + self.width]
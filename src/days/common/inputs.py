@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import mmap
+import re
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+INTEGER = re.compile(r"-?\d+")
+INTEGER_BYTES = re.compile(rb"-?\d+")
+# For inputs where "-" separates numbers, e.g. "2-4"
+NATURAL = re.compile(r"\d+")
+NATURAL_BYTES = re.compile(rb"\d+")
+WHITESPACE = b" \t\r\n"
+
+
+def day_input(solver: str, name: str) -> str:
+    """
+    Path of an input kept next to a day's solver, so a day finds it from any working directory.
+    :param solver: The solver's __file__
+    :param name: e.g. "input.txt"
+    :return:
+    """
+    return str(Path(solver).with_name(name))
+
+
+def read_lines(filename: str) -> Iterator[str]:
+    """
+    Streams the lines of a file with trailing whitespace removed, one at a time.
+    :param filename:
+    :return:
+    """
+    with open(filename, "r", encoding="utf-8") as f:
+        for line in f:
+            yield line.rstrip()
+
+
+@contextmanager
+def map_line(filename: str) -> Iterator[memoryview]:
+    """
+    Maps a single-line input into memory and yields a read-only view of it without the
+    trailing newline. Indexing the view gives byte values; the view is released on exit,
+    so copy anything that has to outlive the block.
+    :param filename:
+    :return:
+    """
+    with open(filename, "rb") as f:
+        if not f.seek(0, 2):
+            yield memoryview(b"")
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            end = len(mapped)
+            while end and mapped[end - 1] in WHITESPACE:
+                end -= 1
+            with memoryview(mapped) as view, view[:end] as line:
+                yield line
+
+
+def ints(text: str | bytes, negative: bool = True) -> list[int]:
+    """
+    Every integer in the text, in order.
+    :param text:
+    :param negative: Read a leading "-" as a sign rather than a separator
+    :return:
+    """
+    if isinstance(text, bytes):
+        pattern = INTEGER_BYTES if negative else NATURAL_BYTES
+    else:
+        pattern = INTEGER if negative else NATURAL
+    return list(map(int, pattern.findall(text)))
+
+
+def read_ints(filename: str, negative: bool = True) -> list[int]:
+    """
+    Every integer in a file, scanned straight from a memory map without decoding it.
+    :param filename:
+    :param negative: Read a leading "-" as a sign rather than a separator
+    :return:
+    """
+    with open(filename, "rb") as f:
+        if not f.seek(0, 2):
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            pattern = INTEGER_BYTES if negative else NATURAL_BYTES
+            return list(map(int, pattern.findall(mapped)))
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any, ContextManager, Iterator
+
+if TYPE_CHECKING:
+    from days.common.profiler import ProfileFiles
+
+PROFILE_DIR = "profiles"
+
+
+@dataclass
+class Phase:
+    name: str
+    elapsed_ns: int
+    peak_memory: int | None = None
+
+    def __str__(self) -> str:
+        memory = f"  peak {self.peak_memory / 1024:10.1f} KiB" if self.peak_memory is not None else ""
+        return f"{self.name:<8} {self.elapsed_ns / 1e6:12.3f} ms{memory}"
+
+
+@dataclass
+class Report:
+    phases: list[Phase] = field(default_factory=list)
+
+    def __str__(self) -> str:
+        return "\n".join(str(phase) for phase in self.phases)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+
+_report: Report | None = None
+
+
+@contextmanager
+def recording(trace_memory: bool = False) -> Iterator[Report]:
+    """
+    Collects every phase executed inside the block into a Report.
+    :param trace_memory: Track the peak Python heap usage of each phase with tracemalloc
+    :return:
+    """
+    global _report
+    previous = _report
+    _report = Report()
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    try:
+        yield _report
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+        _report = previous
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """
+    Times a named phase of a solution (e.g. "parse", "part 1", "part 2").
+    Usable as a context manager or a decorator; does nothing outside of recording().
+    :param name:
+    :return:
+    """
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.reset_peak()
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter_ns() - start
+        if _report is not None:
+            peak = tracemalloc.get_traced_memory()[1] if tracing else None
+            _report.phases.append(Phase(name, elapsed, peak))
+
+
+def profiling(name: str, enabled: bool = True, **options: Any) -> ContextManager[ProfileFiles | None]:
+    """
+    days.common.profiler.profiling() when enabled. The profiler brings in cProfile, pstats and
+    threading, so it is only imported once a run asks for a profile.
+    :param name: e.g. the day, "09"
+    :param enabled: Does nothing when False, so callers can pass a command line flag
+    :param options: directory and interval, see days.common.profiler.profiling()
+    :return:
+    """
+    if not enabled:
+        return nullcontext()
+    from days.common import profiler
+
+    return profiler.profiling(name, **options)
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import cProfile
+import pstats
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from types import FrameType
+from typing import Iterator
+
+from days.common.instrument import PROFILE_DIR
+# Seconds between stack samples
+SAMPLE_INTERVAL = 0.001
+HOTSPOT_LIMIT = 40
+
+
+@dataclass
+class ProfileFiles:
+    # Raw cProfile statistics, readable by pstats, snakeviz etc.
+    stats: Path
+    # Functions sorted by own time, then by cumulative time
+    hotspots: Path
+    # "frame;frame;frame count" lines for flamegraph.pl, speedscope, inferno etc.
+    collapsed: Path
+
+    def __str__(self) -> str:
+        return f"Profile written to {self.hotspots}, {self.collapsed} and {self.stats}"
+
+
+def frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    name = getattr(code, "co_qualname", code.co_name)
+    path = Path(code.co_filename)
+    return f"{name} ({path.parent.name}/{path.name}:{code.co_firstlineno})"
+
+
+def stack_depth(frame: FrameType | None) -> int:
+    depth = 0
+    while frame is not None:
+        depth += 1
+        frame = frame.f_back
+    return depth
+
+
+class StackSampler:
+    """
+    Samples the stack of one thread from a background thread and counts identical stacks.
+    """
+    thread_id: int
+    # Outermost frames shared by every sample (e.g. the runner), left out of the stacks
+    skip: int
+    interval: float
+    stacks: Counter[tuple[str, ...]]
+    _stop: threading.Event
+    _thread: threading.Thread
+
+    def __init__(self, thread_id: int, skip: int = 0, interval: float = SAMPLE_INTERVAL) -> None:
+        self.thread_id = thread_id
+        self.skip = skip
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(frame_label(frame))
+                frame = frame.f_back
+            if stack := stack[::-1][self.skip:]:
+                self.stacks[tuple(stack)] += 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def write_hotspots(profile: cProfile.Profile, path: Path, limit: int = HOTSPOT_LIMIT) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        stats = pstats.Stats(profile, stream=f)
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(limit)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+
+
+@contextmanager
+def profiling(
+    name: str, enabled: bool = True, directory: str | Path = PROFILE_DIR, interval: float = SAMPLE_INTERVAL
+) -> Iterator[ProfileFiles | None]:
+    """
+    Profiles the block with cProfile for a hotspot table and with a stack sampler for
+    flamegraph-ready collapsed stacks. Files are named after `name` inside `directory`.
+    :param name: e.g. the day, "09"
+    :param enabled: Does nothing when False, so callers can pass a command line flag
+    :param directory:
+    :param interval: Seconds between stack samples
+    :return: The files that are written once the block exits, or None when disabled
+    """
+    if not enabled:
+        yield None
+        return
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    files = ProfileFiles(
+        directory / f"{name}.prof",
+        directory / f"{name}-hotspots.txt",
+        directory / f"{name}.collapsed",
+    )
+    # Start the stacks at the code running the with block: this generator <- __enter__ <- caller
+    sampler = StackSampler(threading.get_ident(), stack_depth(sys._getframe(2)) - 1, interval)
+    profile = cProfile.Profile()
+    # The sampler needs the GIL to take a sample; by default it would only get it every 5 ms
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(min(switch_interval, interval))
+    sampler.start()
+    profile.enable()
+    try:
+        yield files
+    finally:
+        profile.disable()
+        sampler.stop()
+        sys.setswitchinterval(switch_interval)
+        profile.dump_stats(files.stats)
+        write_hotspots(profile, files.hotspots)
+        files.collapsed.write_text(sampler.collapsed(), encoding="utf-8")
@@ -0,0 +1,339 @@
+from __future__ import annotations
+
+import argparse
+import ast
+import contextlib
+import importlib
+import io
+import json
+import multiprocessing
+import os
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from multiprocessing.connection import Connection
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+from days.common.cache import (
+    PARSE_CACHE_DIR,
+    RESULT_CACHE_DIR,
+    caching,
+    load_result,
+    result_key,
+    store_result,
+)
+from days.common.instrument import PROFILE_DIR, Phase, profiling, recording
+
+DAYS_DIR = Path(__file__).parent
+ALL_DAYS = [f"{day:02d}" for day in range(1, 26)]
+# Seconds a day may run before it is stopped; day 16 never finishes on its input
+DEFAULT_TIMEOUT = 120
+
+
+@dataclass
+class DayResult:
+    day: str
+    filename: str
+    output: str
+    wall_time: float
+    cpu_time: float
+    error: str | None = None
+    phases: list[Phase] = field(default_factory=list)
+    # The output came from the result cache; times are those of the lookup
+    cached: bool = False
+
+    def __str__(self) -> str:
+        status = "cached" if self.cached else "ok" if self.error is None else "error"
+        out = f"Day {self.day}: {status:<6} wall {self.wall_time:9.4f}s  cpu {self.cpu_time:9.4f}s"
+        for phase in self.phases:
+            out += f"\n    {phase}"
+        return out
+
+
+def parse_days(spec: str) -> list[str]:
+    """
+    Expands a day specification such as "01-25", "3,5" or "01-05,12" into day directory names.
+    :param spec:
+    :return:
+    """
+    days = []
+    for part in spec.split(","):
+        match part.split("-"):
+            case [day]:
+                days.append(f"{int(day):02d}")
+            case [first, last]:
+                days.extend(f"{day:02d}" for day in range(int(first), int(last) + 1))
+            case _:
+                raise ValueError(f"Invalid day specification: {part}")
+    for day in days:
+        if day not in ALL_DAYS:
+            raise ValueError(f"No such day: {day}")
+    return days
+
+
+def load_day(day: str) -> ModuleType:
+    return importlib.import_module(f"days.{day}.main")
+
+
+def input_path(day: str, input_name: str) -> Path:
+    return DAYS_DIR / day / input_name
+
+
+def solver_sources(day: str) -> list[Path]:
+    """
+    Source files an answer of the day depends on: the day's modules and the shared ones.
+    :param day:
+    :return:
+    """
+    return [*sorted((DAYS_DIR / day).glob("*.py")), *sorted((DAYS_DIR / "common").glob("*.py"))]
+
+
+def parse_param(param: str) -> tuple[str, Any]:
+    """
+    Parses a NAME=VALUE solver parameter; values are Python literals or else plain strings.
+    :param param:
+    :return:
+    """
+    name, separator, value = param.partition("=")
+    if not separator or not name:
+        raise argparse.ArgumentTypeError(f"Expected NAME=VALUE, got {param!r}")
+    try:
+        return name, ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return name, value
+
+
+def run_day(day: str, input_name: str = "input.txt", **kwargs: Any) -> DayResult:
+    return run_file(day, str(input_path(day, input_name)), **kwargs)
+
+
+def run_file(
+    day: str,
+    filename: str,
+    trace_memory: bool = False,
+    parse_cache: str | None = None,
+    result_cache: str | None = None,
+    force: bool = False,
+    params: dict[str, Any] | None = None,
+    profile: str | None = None,
+) -> DayResult:
+    """
+    Runs a day's solution on a file, capturing its output and timing its phases.
+    :param day:
+    :param filename:
+    :param trace_memory: Track the peak memory of each phase
+    :param parse_cache: Directory of the parsed-input cache; None disables it
+    :param result_cache: Directory of the answer cache; None disables it
+    :param force: Recompute the answer even if it is cached, then refresh the cache; implied by
+        trace_memory, since a cached answer has no phases to report
+    :param params: Keyword arguments for the day's run(), e.g. rock_count
+    :param profile: Directory to write a hotspot table and collapsed stacks to; implies force
+    :return:
+    """
+    params = params or {}
+    output = io.StringIO()
+    error = None
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+
+    key = result_key(filename, solver_sources(day), params) if result_cache else None
+    lookup = key and not force and not trace_memory and profile is None
+    if lookup and (cached := load_result(result_cache, key)) is not None:
+        return DayResult(
+            day,
+            filename,
+            cached["output"],
+            time.perf_counter() - wall_start,
+            time.process_time() - cpu_start,
+            cached=True,
+        )
+
+    profiler = profiling(f"{day}-{Path(filename).stem}", profile is not None, directory=profile or PROFILE_DIR)
+    with recording(trace_memory) as report, caching(parse_cache), profiler:
+        try:
+            with contextlib.redirect_stdout(output):
+                load_day(day).run(filename, **params)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+    result = DayResult(
+        day,
+        filename,
+        output.getvalue(),
+        time.perf_counter() - wall_start,
+        time.process_time() - cpu_start,
+        error,
+        report.phases,
+    )
+    # Failures are never cached so that they are retried
+    if key and error is None:
+        store_result(result_cache, key, {"day": day, "params": params, "output": result.output})
+    return result
+
+
+def _run_and_send(connection: Connection, day: str, input_name: str, kwargs: dict[str, Any]) -> None:
+    if hasattr(os, "setsid"):
+        # Lead a process group of its own so that a timeout also stops any workers the day starts
+        os.setsid()
+    with connection:
+        connection.send(run_day(day, input_name, **kwargs))
+
+
+def _kill(process: multiprocessing.Process) -> None:
+    if hasattr(os, "killpg"):
+        with contextlib.suppress(ProcessLookupError):
+            os.killpg(process.pid, signal.SIGKILL)
+    # In case it timed out before getting to setsid()
+    process.kill()
+
+
+def run_isolated(day: str, input_name: str, timeout: float, **kwargs: Any) -> DayResult:
+    """
+    run_day() in a process of its own, which is killed along with any workers it started if the
+    day runs past the timeout. The process is not a pool worker, so days can still start process
+    pools of their own.
+    :param day:
+    :param input_name:
+    :param timeout: Seconds
+    :param kwargs: Options passed on to run_file()
+    :return:
+    """
+    start = time.perf_counter()
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=_run_and_send, args=(sender, day, input_name, kwargs))
+    process.start()
+    sender.close()
+    with receiver:
+        try:
+            if receiver.poll(timeout):
+                result = receiver.recv()
+                process.join()
+                return result
+            error = f"timed out after {timeout:g}s"
+        except EOFError:
+            process.join()
+            error = f"worker exited with code {process.exitcode}"
+    _kill(process)
+    process.join()
+    return DayResult(day, str(input_path(day, input_name)), "", time.perf_counter() - start, 0.0, error)
+
+
+def run_days(
+    days: list[str],
+    input_name: str = "input.txt",
+    jobs: int | None = None,
+    timeout: float | None = None,
+    **kwargs: Any,
+) -> list[DayResult]:
+    """
+    Runs several days, in parallel worker processes unless jobs is 1.
+    :param days:
+    :param input_name: Input file name inside each day directory
+    :param jobs: Number of worker processes; None uses every CPU
+    :param timeout: Seconds each day may run before it is stopped and reported as an error;
+        None lets days run in the pool without a limit
+    :param kwargs: Options passed on to run_file()
+    :return:
+    """
+    if timeout is not None:
+        # Each day gets its own process so that one that hangs can be stopped on its own
+        with ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as executor:
+            return list(executor.map(partial(run_isolated, input_name=input_name, timeout=timeout, **kwargs), days))
+    if jobs == 1:
+        return [run_day(day, input_name, **kwargs) for day in days]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(partial(run_day, input_name=input_name, **kwargs), days))
+
+
+def write_report(results: list[DayResult], path: str) -> None:
+    report = [{key: value for key, value in asdict(result).items() if key != "output"} for result in results]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="days", description="Advent of Code 2022 solutions")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="Run one or more days")
+    run_parser.add_argument("days", nargs="?", default="01-25", help="Days to run, e.g. 01-25 or 3,5,7")
+    run_parser.add_argument("--input", default="input.txt", help="Input file name inside each day directory")
+    run_parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count(), help="Number of worker processes")
+    run_parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        help=f"Seconds each day may run before it is stopped; 0 for no limit (default {DEFAULT_TIMEOUT})",
+    )
+    run_parser.add_argument(
+        "--json", metavar="PATH", help="Write per-day and per-phase timings as JSON; bypasses cached answers"
+    )
+    run_parser.add_argument(
+        "--memory", action="store_true", help="Trace peak memory of each phase (slower); bypasses cached answers"
+    )
+    run_parser.add_argument(
+        "--parse-cache",
+        nargs="?",
+        const=PARSE_CACHE_DIR,
+        metavar="DIR",
+        help=f"Reuse parsed inputs of days that support it, stored in DIR (default {PARSE_CACHE_DIR})",
+    )
+    run_parser.add_argument(
+        "--result-cache",
+        default=RESULT_CACHE_DIR,
+        metavar="DIR",
+        help=f"Reuse answers for unchanged inputs, solver sources and parameters (default {RESULT_CACHE_DIR})",
+    )
+    run_parser.add_argument("--no-result-cache", action="store_true", help="Neither read nor write cached answers")
+    run_parser.add_argument("--force", action="store_true", help="Recompute cached answers and refresh them")
+    run_parser.add_argument(
+        "--profile",
+        nargs="?",
+        const=PROFILE_DIR,
+        metavar="DIR",
+        help=f"Profile each day and write hotspots and flamegraph stacks to DIR (default {PROFILE_DIR})",
+    )
+    run_parser.add_argument(
+        "--param",
+        action="append",
+        type=parse_param,
+        default=[],
+        metavar="NAME=VALUE",
+        help="Keyword argument for each day's run(), e.g. rock_count=2022 (repeatable)",
+    )
+    args = parser.parse_args(argv)
+
+    days = parse_days(args.days)
+    parse_cache = str(Path(args.parse_cache).resolve()) if args.parse_cache else None
+    result_cache = None if args.no_result_cache else str(Path(args.result_cache).resolve())
+    start = time.perf_counter()
+    results = run_days(
+        days,
+        args.input,
+        args.jobs,
+        args.timeout or None,
+        trace_memory=args.memory,
+        parse_cache=parse_cache,
+        result_cache=result_cache,
+        # Timings and memory are only reported for answers that are actually computed
+        force=args.force or args.json is not None,
+        params=dict(args.param),
+        profile=str(Path(args.profile).resolve()) if args.profile else None,
+    )
+    total_wall = time.perf_counter() - start
+
+    for result in results:
+        print(f"===== Day {result.day} =====")
+        print(result.output, end="")
+        if result.error:
+            print(result.error)
+        print()
+
+    for result in results:
+        print(result)
+    print(f"Total: wall {total_wall:.4f}s  cpu {sum(result.cpu_time for result in results):.4f}s")
+    if args.json:
+        write_report(results, args.json)
+    return 0 if all(result.error is None for result in results) else 1
@@ -1,20 +1,29 @@
 from __future__ import annotations
 
-import time
+import sys
+from pathlib import Path
+
+from days.common.inputs import day_input, read_lines
+from days.common.instrument import phase, profiling, recording
 
 
 def run(filename: str) -> None:
-    with open(filename, "r", encoding="utf-8") as f:
-        lines = [line.rstrip() for line in f.readlines()]
+    with phase("parse"):
+        lines = list(read_lines(filename))
     print(f"File: {filename}")
 
-    # solution here
+    with phase("part 1"):
+        # solution here
+        pass
+
+    with phase("part 2"):
+        pass
 
     print()
 
 
 if __name__ == '__main__':
-    start = time.time()
-    run("example.txt")
-    run("input.txt")
-    print(f"Time to execute: {time.time() - start}")
+    with recording() as report, profiling(Path(__file__).parent.name, "--profile" in sys.argv):
+        run(day_input(__file__, "example.txt"))
+        run(day_input(__file__, "input.txt"))
+    print(report)